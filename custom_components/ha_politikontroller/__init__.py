@@ -1,63 +1,134 @@
 """The Politikontroller events component."""
 from __future__ import annotations
 
+import asyncio
+from importlib import import_module
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_registry import (
     async_entries_for_config_entry,
     async_get,
 )
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, PLATFORMS, URL_BASE
-from .manager import PolitikontrollerFeedEntityManager
-from .static import locate_dir
+from .const import DOMAIN, PLATFORMS, STORAGE_KEY, STORAGE_VERSION
+from .static import async_setup_static
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
+    from .manager import PolitikontrollerFeedEntityManager
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _import_runtime_modules() -> None:
+    """Import the modules that need the API client library."""
+    import_module(f"{__name__}.services")
+    import_module(f"{__name__}.websocket_api")
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the Politikontroller events component."""
+    # The API client library is slow to import, so it is only imported when the
+    # integration is set up, in the executor, and not for the config flow.
+    start = time.monotonic()
+    await asyncio.gather(
+        hass.async_add_import_executor_job(_import_runtime_modules),
+        async_setup_static(hass),
+    )
+    _LOGGER.debug("Modules imported in %.3f s", time.monotonic() - start)
+
+    from .geojson import PolitikontrollerGeoJsonView
+    from .services import async_setup_services
+    from .websocket_api import async_register_websocket_commands
+
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    hass.http.register_view(PolitikontrollerGeoJsonView())
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up the Politikontroller events component as config entry."""
+    from .manager import PolitikontrollerFeedEntityManager
+
+    start = time.monotonic()
     feeds = hass.data.setdefault(DOMAIN, {})
     # Create feed entity manager for all platforms.
     entity_manager = PolitikontrollerFeedEntityManager(hass, config_entry)
     feeds[config_entry.entry_id] = entity_manager
     _LOGGER.debug("Feed entity manager added for %s", config_entry.entry_id)
-    await remove_orphaned_entities(hass, config_entry.entry_id)
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
-    await entity_manager.async_init()
-
-    static_path = locate_dir()
-    hass.http.register_static_path(
-        f"{URL_BASE}/img",
-        f"{static_path}/img",
+    await entity_manager.async_restore()
+    await remove_orphaned_entities(
+        hass,
+        config_entry.entry_id,
+        entity_manager.managed_external_ids if entity_manager.create_entities else set(),
+    )
+    # Platforms only need the restored feed state, so they are set up while the
+    # account is authenticated.
+    init = hass.async_create_task(
+        entity_manager.async_init(), f"{DOMAIN} init {config_entry.entry_id}"
+    )
+    try:
+        await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+        await init
+    except Exception:
+        init.cancel()
+        await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+        feeds.pop(config_entry.entry_id)
+        await entity_manager.async_stop()
+        raise
+    config_entry.async_on_unload(
+        config_entry.add_update_listener(async_update_options)
+    )
+    # Only update once the platforms listen for new entities.
+    entity_manager.async_start()
+    entity_manager.setup_duration = time.monotonic() - start
+    _LOGGER.debug(
+        "Set up %s in %.3f s", config_entry.entry_id, entity_manager.setup_duration
     )
     return True
 
 
-async def remove_orphaned_entities(hass: HomeAssistant, entry_id: str) -> None:
+async def remove_orphaned_entities(
+    hass: HomeAssistant, entry_id: str, external_ids: set[str]
+) -> None:
     """Remove orphaned geo_location entities.
 
     This is needed because when fetching data from the external feed this integration is
     determining which entities need to be added, updated or removed by comparing the
-    current with the previous data. After a restart of Home Assistant the integration
-    has no previous data to compare against, and thus all entities managed by this
-    integration are removed after startup.
+    current with the previous data. After a restart of Home Assistant only the entities
+    in the stored feed state can be compared against, and thus all other entities
+    managed by this integration are removed after startup.
     """
     entity_registry = async_get(hass)
+    keep_unique_ids = {f"{entry_id}_{external_id}" for external_id in external_ids}
     orphaned_entries = async_entries_for_config_entry(entity_registry, entry_id)
     if orphaned_entries is not None:
         for entry in orphaned_entries:
-            if entry.domain == Platform.GEO_LOCATION:
+            if (
+                entry.domain == Platform.GEO_LOCATION
+                and entry.unique_id not in keep_unique_ids
+            ):
                 _LOGGER.debug("Removing orphaned entry %s", entry.entity_id)
                 entity_registry.async_remove(entry.entity_id)
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the feed entity manager."""
+    entity_manager: PolitikontrollerFeedEntityManager = hass.data[DOMAIN][entry.entry_id]
+    await entity_manager.async_update_options(entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload the Politikontroller events config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -65,3 +136,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entity_manager: PolitikontrollerFeedEntityManager = hass.data[DOMAIN].pop(entry.entry_id)
         await entity_manager.async_stop()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored feed state when a config entry is removed."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)).async_remove()
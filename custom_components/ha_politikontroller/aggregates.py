@@ -0,0 +1,90 @@
+"""Feed aggregates for the Politikontroller events integration."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from .models import PolitikontrollerControl
+
+
+class PolitikontrollerAggregates:
+    """Count per type and newest of the managed feed entries.
+
+    The aggregates are maintained from the entries created, updated and removed by
+    each update, instead of from all entries.
+    """
+
+    def __init__(self, entries: Mapping[str, PolitikontrollerControl]) -> None:
+        """Initialize the aggregates of the feed entries."""
+        self.type_counts: Counter[str] = Counter()
+        self._entries = entries
+        self._types: dict[str, str] = {}
+        self._newest: PolitikontrollerControl | None = None
+        self._newest_outdated = False
+
+    def __len__(self) -> int:
+        """Return the number of aggregated entries."""
+        return len(self._types)
+
+    def add(self, entry: PolitikontrollerControl) -> None:
+        """Add or update an entry."""
+        if (previous := self._types.get(entry.id)) != entry.type_name:
+            if previous is not None:
+                self._count(previous, -1)
+            self._count(entry.type_name, 1)
+            self._types[entry.id] = entry.type_name
+        if self._newest is not None and self._newest.id == entry.id:
+            # The timestamp may have moved back, find the newest again when needed.
+            self._newest_outdated = True
+        elif not self._newest_outdated and _is_newer(entry, self._newest):
+            self._newest = entry
+
+    def remove(self, external_id: str) -> None:
+        """Remove an entry."""
+        if (previous := self._types.pop(external_id, None)) is not None:
+            self._count(previous, -1)
+        if self._newest is not None and self._newest.id == external_id:
+            self._newest = None
+            self._newest_outdated = True
+
+    def reset(self, external_ids: Iterable[str]) -> None:
+        """Aggregate the given entries from scratch."""
+        self.type_counts.clear()
+        self._types = {}
+        self._newest = None
+        self._newest_outdated = False
+        for external_id in external_ids:
+            self.add(self._entries[external_id])
+
+    @property
+    def newest(self) -> PolitikontrollerControl | None:
+        """Return the entry with the latest timestamp."""
+        if self._newest_outdated:
+            self._newest = None
+            for external_id in self._types:
+                if (entry := self._entries.get(external_id)) is not None and _is_newer(
+                    entry, self._newest
+                ):
+                    self._newest = entry
+            self._newest_outdated = False
+        return self._newest
+
+    def _count(self, type_name: str, change: int) -> None:
+        """Change the count of a type, dropping types that are no longer counted."""
+        self.type_counts[type_name] += change
+        if self.type_counts[type_name] <= 0:
+            del self.type_counts[type_name]
+
+
+def _is_newer(
+    entry: PolitikontrollerControl, other: PolitikontrollerControl | None
+) -> bool:
+    """Return whether an entry has a later timestamp than another entry."""
+    if other is None:
+        return True
+    if entry.timestamp is None:
+        return False
+    return other.timestamp is None or entry.timestamp > other.timestamp
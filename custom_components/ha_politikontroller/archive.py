@@ -0,0 +1,306 @@
+"""Archive of observed controls for the Politikontroller events integration."""
+from __future__ import annotations
+
+import logging
+from math import cos, floor, radians
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ARCHIVE_CELL_SIZE,
+    ARCHIVE_FILE,
+    ARCHIVE_FLUSH_DELAY,
+    DATA_ARCHIVE,
+)
+from .geo import haversine
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import datetime
+
+    from homeassistant.core import Event, HomeAssistant
+
+    from .models import PolitikontrollerControl
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTIC_HEATMAP = "heatmap"
+STATISTIC_HOURS = "hours"
+STATISTIC_LOCATIONS = "locations"
+STATISTIC_TYPES = "types"
+STATISTICS = [STATISTIC_TYPES, STATISTIC_HOURS, STATISTIC_HEATMAP, STATISTIC_LOCATIONS]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS controls (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    cell_lat INTEGER NOT NULL,
+    cell_lng INTEGER NOT NULL,
+    description TEXT,
+    county TEXT,
+    municipality TEXT,
+    reported INTEGER,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER
+);
+CREATE INDEX IF NOT EXISTS controls_cell ON controls (cell_lat, cell_lng);
+CREATE INDEX IF NOT EXISTS controls_first_seen ON controls (first_seen);
+CREATE INDEX IF NOT EXISTS controls_type_first_seen ON controls (type, first_seen);
+"""
+
+INSERT = """
+INSERT INTO controls (
+    id, type, lat, lng, cell_lat, cell_lng, description, county, municipality,
+    reported, first_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET last_seen = NULL
+"""
+
+UPDATE_LAST_SEEN = "UPDATE controls SET last_seen = ? WHERE id = ?"
+
+
+def cell(coordinate: float) -> int:
+    """Return the archive grid cell of a latitude or longitude."""
+    return floor(coordinate / ARCHIVE_CELL_SIZE)
+
+
+class PolitikontrollerArchive:
+    """Append-only archive of the controls seen by all config entries.
+
+    Every control is written when it is first seen, and again when it is last seen.
+    Writes are batched, and all database access is done in the executor.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the archive."""
+        self._hass = hass
+        self._path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._first_seen: list[tuple] = []
+        self._last_seen: list[tuple[int, str]] = []
+        self._unsub_flush: Callable[[], None] | None = None
+
+    @callback
+    def async_record(
+        self, created: Iterable[PolitikontrollerControl], removed: Iterable[str]
+    ) -> None:
+        """Queue controls that were first seen, and ids of controls last seen."""
+        now = int(time.time())
+        self._first_seen.extend(
+            (
+                entry.id,
+                entry.type_name,
+                entry.lat,
+                entry.lng,
+                cell(entry.lat),
+                cell(entry.lng),
+                entry.description,
+                entry.county,
+                entry.municipality,
+                int(entry.timestamp.timestamp()) if entry.timestamp else None,
+                now,
+            )
+            for entry in created
+        )
+        self._last_seen.extend((now, external_id) for external_id in removed)
+        if self._unsub_flush is None and (self._first_seen or self._last_seen):
+            self._unsub_flush = async_call_later(
+                self._hass, ARCHIVE_FLUSH_DELAY, self._async_flush
+            )
+
+    async def _async_flush(self, *_: Any) -> None:
+        """Write all queued controls in one transaction."""
+        self._unsub_flush = None
+        first_seen, self._first_seen = self._first_seen, []
+        last_seen, self._last_seen = self._last_seen, []
+        if first_seen or last_seen:
+            await self._hass.async_add_executor_job(self._write, first_seen, last_seen)
+
+    async def async_close(self) -> None:
+        """Write queued controls, and close the database."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+        await self._async_flush()
+        await self._hass.async_add_executor_job(self._close)
+
+    async def async_query(
+        self,
+        statistic: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        types: list[str] | None = None,
+        area: tuple[float, float, float] | None = None,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """Return a statistic of the archived controls."""
+        await self._async_flush()
+        return await self._hass.async_add_executor_job(
+            self._query, statistic, since, until, types, area, limit
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection to the database, creating the database if needed."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            self._connection.create_function(
+                "distance", 4, haversine, deterministic=True
+            )
+        return self._connection
+
+    def _write(self, first_seen: list[tuple], last_seen: list[tuple[int, str]]) -> None:
+        """Insert controls first seen, and set the last sight of controls."""
+        start = time.monotonic()
+        with self._lock, self._connect() as connection:
+            connection.executemany(INSERT, first_seen)
+            connection.executemany(UPDATE_LAST_SEEN, last_seen)
+        _LOGGER.debug(
+            "Archived %d new and %d gone controls in %.3f s",
+            len(first_seen),
+            len(last_seen),
+            time.monotonic() - start,
+        )
+
+    def _close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _query(
+        self,
+        statistic: str,
+        since: datetime | None,
+        until: datetime | None,
+        types: list[str] | None,
+        area: tuple[float, float, float] | None,
+        limit: int,
+    ) -> dict[str, Any]:
+        """Run a statistic query, using the time, type and grid cell indexes.
+
+        An area is first narrowed to the grid cells of its bounding box, and then to
+        the controls within its radius.
+        """
+        conditions = []
+        parameters: list[Any] = []
+        if since is not None:
+            conditions.append("first_seen >= ?")
+            parameters.append(int(since.timestamp()))
+        if until is not None:
+            conditions.append("first_seen < ?")
+            parameters.append(int(until.timestamp()))
+        if types:
+            conditions.append(f"type IN ({', '.join('?' * len(types))})")
+            parameters.extend(types)
+        if area is not None:
+            lat, lng, radius = area
+            lat_margin = radius / 111.0
+            lng_margin = radius / (111.0 * max(cos(radians(lat)), 0.01))
+            conditions.append(
+                "cell_lat BETWEEN ? AND ? AND cell_lng BETWEEN ? AND ? "
+                "AND distance(?, ?, lat, lng) <= ?"
+            )
+            parameters.extend(
+                (
+                    cell(lat - lat_margin),
+                    cell(lat + lat_margin),
+                    cell(lng - lng_margin),
+                    cell(lng + lng_margin),
+                    lat,
+                    lng,
+                    radius,
+                )
+            )
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        start = time.monotonic()
+        with self._lock:
+            connection = self._connect()
+            if statistic == STATISTIC_TYPES:
+                rows = connection.execute(
+                    f"SELECT type, COUNT(*) FROM controls {where} "  # noqa: S608
+                    "GROUP BY type ORDER BY COUNT(*) DESC",
+                    parameters,
+                ).fetchall()
+                result: dict[str, Any] = {"types": dict(rows)}
+            elif statistic == STATISTIC_HOURS:
+                # Counted per hour since the epoch, and then per local hour of day.
+                hours: dict[str, list[int]] = {}
+                for type_name, hour, count in connection.execute(
+                    "SELECT type, first_seen / 3600, COUNT(*) "  # noqa: S608
+                    f"FROM controls {where} GROUP BY 1, 2",
+                    parameters,
+                ):
+                    local_hour = dt_util.as_local(
+                        dt_util.utc_from_timestamp(hour * 3600)
+                    ).hour
+                    hours.setdefault(type_name, [0] * 24)[local_hour] += count
+                result = {"hours": hours}
+            elif statistic == STATISTIC_HEATMAP:
+                rows = connection.execute(
+                    "SELECT cell_lat, cell_lng, COUNT(*) FROM controls "  # noqa: S608
+                    f"{where} GROUP BY cell_lat, cell_lng ORDER BY COUNT(*) DESC "
+                    "LIMIT ?",
+                    [*parameters, limit],
+                ).fetchall()
+                result = {
+                    "cell_size": ARCHIVE_CELL_SIZE,
+                    "cells": [
+                        {
+                            "latitude": round((row + 0.5) * ARCHIVE_CELL_SIZE, 6),
+                            "longitude": round((col + 0.5) * ARCHIVE_CELL_SIZE, 6),
+                            "count": count,
+                        }
+                        for row, col, count in rows
+                    ],
+                }
+            else:
+                # Controls reported again at about the same place, within ~100 m.
+                rows = connection.execute(
+                    "SELECT ROUND(lat, 3), ROUND(lng, 3), COUNT(*), "  # noqa: S608
+                    "GROUP_CONCAT(DISTINCT type), MAX(first_seen) "
+                    f"FROM controls {where} GROUP BY 1, 2 HAVING COUNT(*) > 1 "
+                    "ORDER BY COUNT(*) DESC LIMIT ?",
+                    [*parameters, limit],
+                ).fetchall()
+                result = {
+                    "locations": [
+                        {
+                            "latitude": lat,
+                            "longitude": lng,
+                            "count": count,
+                            "types": type_names.split(","),
+                            "latest": dt_util.as_local(
+                                dt_util.utc_from_timestamp(latest)
+                            ).isoformat(),
+                        }
+                        for lat, lng, count, type_names, latest in rows
+                    ]
+                }
+        _LOGGER.debug("Queried %s in %.3f s", statistic, time.monotonic() - start)
+        return result
+
+
+@callback
+def async_get_archive(hass: HomeAssistant) -> PolitikontrollerArchive:
+    """Return the archive, opening it on first use."""
+    if (archive := hass.data.get(DATA_ARCHIVE)) is None:
+        archive = PolitikontrollerArchive(hass, Path(hass.config.path(ARCHIVE_FILE)))
+        hass.data[DATA_ARCHIVE] = archive
+
+        async def close(event: Event) -> None:  # noqa: ARG001
+            await archive.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, close)
+    return archive
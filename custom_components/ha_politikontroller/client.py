@@ -0,0 +1,191 @@
+"""Shared clients for the Politikontroller events integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING, Any
+
+from politikontroller_py import Client
+from politikontroller_py.exceptions import NoAccessError, NoContentError
+from politikontroller_py.models import PoliceGPSControlsResponse
+from politikontroller_py.models.api import APIEndpoint
+from politikontroller_py.utils import merge_duplicate_controls
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DATA_CLIENTS, RESPONSE_CACHE_SIZE
+from .coordinator import PolitikontrollerFetchCoordinator
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from politikontroller_py.models import Account
+    from politikontroller_py.models.api import PolitiKontrollerRequest
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PolitikontrollerClient(Client):
+    """Client that authenticates again when the account is no longer authorized."""
+
+    request_count: int = 0
+    characters_received: int = 0
+    unchanged_responses: int = 0
+    _responses: OrderedDict[tuple, tuple[int, list[PoliceGPSControlsResponse]]] = field(
+        default_factory=OrderedDict
+    )
+    _password: str | None = None
+    _auth_generation: int = 0
+    _auth_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def authenticate_user(self, username: str, password: str) -> Account:
+        """Authenticate user, and remember the credentials for re-authentication."""
+        account = await super().authenticate_user(username, password)
+        self._password = password
+        self._auth_generation += 1
+        return account
+
+    async def do_external_api_request(
+        self,
+        request: PolitiKontrollerRequest,
+        **kwargs: Any,
+    ) -> str:
+        """Do an HTTP request, counting requests and received characters."""
+        self.request_count += 1
+        data = await super().do_external_api_request(request, **kwargs)
+        self.characters_received += len(data)
+        return data
+
+    async def api_request(
+        self,
+        endpoint: APIEndpoint | str,
+        params: dict | None = None,
+        cast_to: type | None = None,
+        is_list: bool = False,  # noqa: FBT001, FBT002
+    ) -> Any:
+        """Do an API request, re-authenticating once if access is denied."""
+        generation = self._auth_generation
+        try:
+            return await super().api_request(
+                endpoint, dict(params or {}), cast_to, is_list
+            )
+        except NoAccessError:
+            if endpoint == APIEndpoint.LOGIN or self.user is None or self._password is None:
+                raise
+        await self._reauthenticate(generation)
+        return await super().api_request(endpoint, dict(params or {}), cast_to, is_list)
+
+    async def get_controls_in_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius: int,
+        speed: int = 100,
+        merge_duplicates: bool = True,  # noqa: FBT001, FBT002
+        **kwargs: Any,
+    ) -> list[PoliceGPSControlsResponse]:
+        """Get all active controls within a radius.
+
+        The hash of the last raw response is kept for each query. When a response is
+        unchanged, the list parsed from the previous response is returned as is, so
+        callers can skip their own processing by comparing identity.
+        """
+        key = (lat, lng, radius, speed, merge_duplicates, tuple(sorted(kwargs.items())))
+        try:
+            data = await self.api_request(
+                APIEndpoint.GPS_CONTROLS,
+                {"vr": radius, "speed": speed, "lat": lat, "lon": lng, **kwargs},
+            )
+        except NoContentError:
+            data = ""
+        digest = hash(data)
+        if (cached := self._responses.get(key)) is not None and cached[0] == digest:
+            self._responses.move_to_end(key)
+            self.unchanged_responses += 1
+            return cached[1]
+        controls = (
+            PoliceGPSControlsResponse.from_response_data(data, multiple=True)
+            if data
+            else []
+        )
+        if merge_duplicates:
+            controls = merge_duplicate_controls(controls)
+        self._responses[key] = (digest, controls)
+        while len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+        return controls
+
+    async def _reauthenticate(self, generation: int) -> None:
+        """Authenticate again, unless another request already did."""
+        async with self._auth_lock:
+            if generation != self._auth_generation:
+                return
+            _LOGGER.debug("Access denied, authenticating %s again", self.user.username)
+            await self.authenticate_user(self.user.username, self._password)
+
+
+class PolitikontrollerClientRegistry:
+    """Registry of authenticated clients, shared by config entries per account.
+
+    Each client is wrapped in a fetch coordinator, so entries of the same account
+    are polled in one cycle, and share their control list queries.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client_factory: Callable[..., PolitikontrollerClient] | None = None,
+    ) -> None:
+        """Initialize the client registry.
+
+        A client factory can be given to fetch from something other than
+        politikontroller.no, like a local stand-in for the API. The registry is kept in
+        hass.data, so it can be put there before any config entry is set up.
+        """
+        self._hass = hass
+        self._client_factory = client_factory or PolitikontrollerClient
+        self._coordinators: dict[str, PolitikontrollerFetchCoordinator] = {}
+        self._references: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(
+        self, username: str, password: str
+    ) -> PolitikontrollerFetchCoordinator:
+        """Return the coordinator for an account, authenticating it if needed."""
+        async with self._lock:
+            if (coordinator := self._coordinators.get(username)) is None:
+                client = self._client_factory(
+                    session=async_get_clientsession(self._hass)
+                )
+                await client.authenticate_user(username=username, password=password)
+                coordinator = PolitikontrollerFetchCoordinator(self._hass, client)
+                self._coordinators[username] = coordinator
+                self._references[username] = 0
+                _LOGGER.debug("Client created for %s", username)
+            self._references[username] += 1
+            return coordinator
+
+    @callback
+    def async_release(self, username: str) -> None:
+        """Release a reference to a client, dropping it when no longer used."""
+        if username not in self._references:
+            return
+        self._references[username] -= 1
+        if self._references[username] <= 0:
+            del self._references[username]
+            self._coordinators.pop(username).async_cancel()
+            _LOGGER.debug("Client released for %s", username)
+
+
+@callback
+def async_get_client_registry(hass: HomeAssistant) -> PolitikontrollerClientRegistry:
+    """Return the client registry for this Home Assistant instance."""
+    if DATA_CLIENTS not in hass.data:
+        hass.data[DATA_CLIENTS] = PolitikontrollerClientRegistry(hass)
+    return hass.data[DATA_CLIENTS]
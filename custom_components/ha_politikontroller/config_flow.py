@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any
 
-from politikontroller_py.models.api import PoliceControlTypeEnum
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -19,21 +18,47 @@ from homeassistant.const import (
 )
 from homeassistant.helpers import config_validation as cv, selector
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    EntitySelector,
+    EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
 )
 from homeassistant.util.unit_conversion import DistanceConverter
 
-from .const import CONF_TYPE_FILTER, DEFAULT_RADIUS_IN_M, DOMAIN
+from .const import (
+    CONF_ARCHIVE,
+    CONF_CORRIDOR_WIDTH,
+    CONF_CREATE_ENTITIES,
+    CONF_FOLLOW_ENTITY,
+    CONF_INLINE_ICONS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_ROUTE,
+    CONF_STALE_FAILURES,
+    CONF_TRACKED_ENTITIES,
+    CONF_TYPE_FILTER,
+    DEFAULT_CORRIDOR_WIDTH_IN_KM,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_RADIUS_IN_M,
+    DEFAULT_STALE_FAILURES,
+    DOMAIN,
+)
+from .geo import parse_route
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
     from homeassistant.data_entry_flow import FlowResult
 
-# noinspection PyUnresolvedReferences
-ENTRY_TYPES = [t.name.lower() for t in PoliceControlTypeEnum]
-
 DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_USERNAME): cv.string,
@@ -44,9 +69,27 @@ DATA_SCHEMA = vol.Schema(
     }
 )
 
+UPDATE_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=30,
+        max=3600,
+        step=30,
+        unit_of_measurement="s",
+        mode=NumberSelectorMode.BOX,
+    )
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def _entry_types() -> list[str]:
+    """Return the control types, importing the API client library when needed."""
+    from politikontroller_py.models.api import PoliceControlTypeEnum
+
+    # noinspection PyUnresolvedReferences
+    return [t.name.lower() for t in PoliceControlTypeEnum]
+
+
 # noinspection PyTypeChecker
 class PolitikontrollerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a Politikontroller events config flow."""
@@ -118,9 +161,16 @@ class OptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input[CONF_MIN_UPDATE_INTERVAL] > user_input[CONF_MAX_UPDATE_INTERVAL]:
+                errors["base"] = "invalid_update_interval"
+            elif not self._valid_route(user_input.get(CONF_ROUTE, "")):
+                errors[CONF_ROUTE] = "invalid_route"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
+        entry_types = await self.hass.async_add_import_executor_job(_entry_types)
         options = vol.Schema(
             {
                 vol.Optional(
@@ -130,10 +180,118 @@ class OptionsFlow(config_entries.OptionsFlow):
                     ),
                 ): SelectSelector(SelectSelectorConfig(
                     multiple=True,
-                    options=ENTRY_TYPES,
+                    options=entry_types,
                     translation_key=CONF_TYPE_FILTER,
-                ))
+                )),
+                vol.Optional(
+                    CONF_MIN_UPDATE_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MIN_UPDATE_INTERVAL,
+                        DEFAULT_MIN_UPDATE_INTERVAL.total_seconds(),
+                    ),
+                ): UPDATE_INTERVAL_SELECTOR,
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        DEFAULT_MAX_UPDATE_INTERVAL.total_seconds(),
+                    ),
+                ): UPDATE_INTERVAL_SELECTOR,
+                vol.Optional(
+                    CONF_POLL_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_POLL_TIMEOUT,
+                        DEFAULT_POLL_TIMEOUT.total_seconds(),
+                    ),
+                ): NumberSelector(NumberSelectorConfig(
+                    min=10,
+                    max=600,
+                    step=5,
+                    unit_of_measurement="s",
+                    mode=NumberSelectorMode.BOX,
+                )),
+                vol.Optional(
+                    CONF_TRACKED_ENTITIES,
+                    default=self.config_entry.options.get(
+                        CONF_TRACKED_ENTITIES, []
+                    ),
+                ): EntitySelector(EntitySelectorConfig(
+                    domain=["device_tracker", "person"],
+                    multiple=True,
+                )),
+                vol.Optional(
+                    CONF_FOLLOW_ENTITY,
+                    description={
+                        "suggested_value": self.config_entry.options.get(
+                            CONF_FOLLOW_ENTITY
+                        )
+                    },
+                ): EntitySelector(EntitySelectorConfig(
+                    domain=["device_tracker", "person"],
+                )),
+                vol.Optional(
+                    CONF_STALE_FAILURES,
+                    default=self.config_entry.options.get(
+                        CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES
+                    ),
+                ): NumberSelector(NumberSelectorConfig(
+                    min=1,
+                    max=20,
+                    mode=NumberSelectorMode.BOX,
+                )),
+                vol.Optional(
+                    CONF_ROUTE,
+                    default=self.config_entry.options.get(CONF_ROUTE, ""),
+                ): TextSelector(TextSelectorConfig(multiline=True)),
+                vol.Optional(
+                    CONF_CORRIDOR_WIDTH,
+                    default=self.config_entry.options.get(
+                        CONF_CORRIDOR_WIDTH, DEFAULT_CORRIDOR_WIDTH_IN_KM
+                    ),
+                ): NumberSelector(NumberSelectorConfig(
+                    min=0.5,
+                    max=25,
+                    step=0.5,
+                    unit_of_measurement=UnitOfLength.KILOMETERS,
+                    mode=NumberSelectorMode.BOX,
+                )),
+                vol.Optional(
+                    CONF_CREATE_ENTITIES,
+                    default=self.config_entry.options.get(
+                        CONF_CREATE_ENTITIES, True
+                    ),
+                ): BooleanSelector(),
+                vol.Optional(
+                    CONF_ARCHIVE,
+                    default=self.config_entry.options.get(CONF_ARCHIVE, False),
+                ): BooleanSelector(),
+                vol.Optional(
+                    CONF_INLINE_ICONS,
+                    default=self.config_entry.options.get(
+                        CONF_INLINE_ICONS, False
+                    ),
+                ): BooleanSelector(),
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=options)
+        return self.async_show_form(
+            step_id="init", data_schema=options, errors=errors
+        )
+
+    def _valid_route(self, route: str) -> bool:
+        """Return whether a route is empty, or only has known locations."""
+
+        def resolve(entity_id: str) -> tuple[float, float] | None:
+            if (state := self.hass.states.get(entity_id)) is None:
+                return None
+            if (latitude := state.attributes.get(CONF_LATITUDE)) is None or (
+                longitude := state.attributes.get(CONF_LONGITUDE)
+            ) is None:
+                return None
+            return (latitude, longitude)
+
+        try:
+            parse_route(route, resolve)
+        except ValueError:
+            return False
+        return True
@@ -7,24 +7,79 @@ from typing import Final
 from homeassistant.const import Platform
 
 DOMAIN: Final = "ha_politikontroller"
+DATA_ARCHIVE: Final = "ha_politikontroller_archive"
+DATA_CLIENTS: Final = "ha_politikontroller_clients"
+DATA_ICONS: Final = "ha_politikontroller_icons"
 
-PLATFORMS: Final = [Platform.GEO_LOCATION]
+PLATFORMS: Final = [Platform.GEO_LOCATION, Platform.SENSOR]
 
+ATTR_BEARING: Final = "bearing"
 ATTR_DESCRIPTION: Final = "description"
-ATTR_DETAILS: Final = "details"
 ATTR_DISTANCE: Final = "distance"
 ATTR_EXTERNAL_ID: Final = "external_id"
+ATTR_LIMIT: Final = "limit"
+ATTR_SINCE: Final = "since"
 ATTR_SOURCE: Final = "source"
+ATTR_STALE: Final = "stale"
+ATTR_STATISTIC: Final = "statistic"
 ATTR_TYPE: Final = "type"
+ATTR_UNTIL: Final = "until"
+CONF_ARCHIVE: Final = "archive"
+CONF_CORRIDOR_WIDTH: Final = "corridor_width"
+CONF_CREATE_ENTITIES: Final = "create_entities"
+CONF_FOLLOW_ENTITY: Final = "follow_entity"
+CONF_INLINE_ICONS: Final = "inline_icons"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_POLL_TIMEOUT: Final = "poll_timeout"
+CONF_ROUTE: Final = "route"
+CONF_STALE_FAILURES: Final = "stale_failures"
+CONF_TRACKED_ENTITIES: Final = "tracked_entities"
 CONF_TYPE_FILTER: Final = "type_filter"
 DEFAULT_RADIUS_IN_KM: Final = 20.0
 DEFAULT_RADIUS_IN_M: Final = 20000.0
+DEFAULT_CORRIDOR_WIDTH_IN_KM: Final = 1.0
+CORRIDOR_QUERY_RADIUS_IN_KM: Final = 10.0
 DEFAULT_UPDATE_INTERVAL: Final = timedelta(seconds=300)
+DEFAULT_STALE_FAILURES: Final = 3
+CIRCUIT_BREAKER_COOLDOWN: Final = timedelta(minutes=15)
+DEFAULT_MIN_UPDATE_INTERVAL: Final = timedelta(seconds=60)
+DEFAULT_MAX_UPDATE_INTERVAL: Final = timedelta(seconds=900)
+DEFAULT_POLL_TIMEOUT: Final = timedelta(seconds=60)
+UPDATE_INTERVAL_JITTER: Final = 0.1
+TRACKER_MOVING_DISTANCE_IN_KM: Final = 0.2
+# Share of the radius a followed entity can move before the query is moved along.
+FOLLOW_REUSE_FRACTION: Final = 0.25
+DEFAULT_DETAIL_CONCURRENCY: Final = 5
+DEFAULT_DETAIL_RETRIES: Final = 2
+DETAIL_RETRY_DELAY: Final = 1.0
+DEFAULT_DETAIL_CACHE_SIZE: Final = 1000
+DEFAULT_DETAIL_CACHE_TTL: Final = timedelta(hours=1)
 ATTRIBUTION: Final = "politikontroller.no"
 URL_BASE: Final = "/politikontroller"
 
+RESPONSE_CACHE_SIZE: Final = 32
+ARCHIVE_FILE: Final = "ha_politikontroller_archive.db"
+ARCHIVE_FLUSH_DELAY: Final = 10
+ARCHIVE_CELL_SIZE: Final = 0.01
+METRICS_WINDOW: Final = 100
+STORAGE_KEY: Final = "ha_politikontroller.{}"
+STORAGE_SAVE_DELAY: Final = 30
+STORAGE_VERSION: Final = 1
+
+SERVICE_GET_CONTROL_DETAILS: Final = "get_control_details"
+SERVICE_QUERY_ARCHIVE: Final = "query_archive"
+
+CHANGE_CREATED: Final = "created"
+CHANGE_CHANGED: Final = "changed"
+CHANGE_REMOVED: Final = "removed"
+EVENT_CONTROL: Final = "ha_politikontroller_control_{}"
+CHANGE_STREAM_QUEUE_SIZE: Final = 1000
+
 SIGNAL_DELETE_ENTITY: Final = "ha_politikontroller_delete_{}"
+SIGNAL_FEED_STARTED: Final = "ha_politikontroller_feed_started"
 SIGNAL_UPDATE_ENTITY: Final = "ha_politikontroller_update_{}"
+SIGNAL_STATUS_UPDATE: Final = "ha_politikontroller_status_{}"
 
 UPDATE_OK = "OK"
 UPDATE_OK_NO_DATA = "OK_NO_DATA"
@@ -0,0 +1,266 @@
+"""Fetch coordinator for the Politikontroller events integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from math import ceil
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .geo import haversine
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+    from politikontroller_py.models import PoliceGPSControlsResponse
+
+    from homeassistant.core import HomeAssistant
+
+    from .client import PolitikontrollerClient
+
+_LOGGER = logging.getLogger(__name__)
+
+Region = tuple[float, float, float]
+
+
+class PolitikontrollerFetchCoordinator:
+    """Poll all config entries of an account in one cycle, sharing their queries.
+
+    Regions of all entries are grouped into clusters of overlapping circles. In a
+    cycle, every entry is polled, and each cluster is fetched with one query covering
+    all of its circles. The result is shared with every entry in the cluster, filtered
+    to the radius of each entry, so upstream requests scale with the number of
+    clusters instead of the number of entries. A cycle runs when the first entry is
+    due.
+
+    Polls outside of a cycle, like the first poll of a new entry, query the regions of
+    that entry on their own, as no other entry reads a covering query then.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: PolitikontrollerClient) -> None:
+        """Initialize the fetch coordinator."""
+        self._hass = hass
+        self.client = client
+        self.upstream_requests = 0
+        self.cycles = 0
+        self._next_id = 0
+        self._regions: dict[int, list[Region]] = {}
+        self._pollers: dict[
+            int, tuple[Callable[[], Awaitable[None]], Callable[[], float]]
+        ] = {}
+        self._filtered: dict[
+            Region,
+            tuple[list[PoliceGPSControlsResponse], list[PoliceGPSControlsResponse]],
+        ] = {}
+        self._pending: dict[Region, asyncio.Task[list[PoliceGPSControlsResponse]]] = {}
+        self._shared: dict[
+            Region, asyncio.Task[list[PoliceGPSControlsResponse]]
+        ] | None = None
+        self._cycle_task: asyncio.Task[None] | None = None
+        self._unsub_cycle: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register_region(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> CALLBACK_TYPE:
+        """Register a region that is queried, and return a callback to unregister it."""
+        return self.async_register_regions([(coordinates[0], coordinates[1], radius)])
+
+    @callback
+    def async_register_regions(self, regions: list[Region]) -> CALLBACK_TYPE:
+        """Register a group of regions, and return a callback to unregister them.
+
+        Regions of a group are never merged with each other, or with other regions, as
+        a group is meant to cover an area that one enclosing circle covers poorly.
+        """
+        group_id = self._next_id
+        self._next_id += 1
+        self._regions[group_id] = list(regions)
+
+        @callback
+        def unregister() -> None:
+            for region in self._regions.pop(group_id, ()):
+                self._filtered.pop(region, None)
+
+        return unregister
+
+    @callback
+    def async_add_poller(
+        self, poll: Callable[[], Awaitable[None]], next_delay: Callable[[], float]
+    ) -> CALLBACK_TYPE:
+        """Poll an entry in every cycle, and return a callback to stop polling it.
+
+        The next delay is the time in seconds the entry wants to wait before its next
+        poll. The next cycle is scheduled by the shortest delay of all entries.
+        """
+        poller_id = self._next_id
+        self._next_id += 1
+        self._pollers[poller_id] = (poll, next_delay)
+        self._schedule_cycle()
+
+        @callback
+        def remove_poller() -> None:
+            self._pollers.pop(poller_id, None)
+            if not self._pollers and self._unsub_cycle is not None:
+                self._unsub_cycle()
+                self._unsub_cycle = None
+
+        return remove_poller
+
+    @callback
+    def _schedule_cycle(self) -> None:
+        """Schedule the next cycle, unless one is scheduled or running."""
+        if self._unsub_cycle is not None or self._cycle_task is not None:
+            return
+        if not self._pollers:
+            return
+
+        async def cycle(event_time: datetime) -> None:  # noqa: ARG001
+            """Run a cycle."""
+            self._unsub_cycle = None
+            await self.async_run_cycle()
+
+        delay = min(next_delay() for _, next_delay in self._pollers.values())
+        _LOGGER.debug("Next poll cycle in %.0f s", delay)
+        self._unsub_cycle = async_call_later(self._hass, delay, cycle)
+
+    async def async_run_cycle(self) -> None:
+        """Poll all entries now, or wait for the cycle that is already running."""
+        if self._unsub_cycle is not None:
+            self._unsub_cycle()
+            self._unsub_cycle = None
+        if self._cycle_task is None:
+            self._cycle_task = self._hass.async_create_background_task(
+                self._async_cycle(), "politikontroller poll cycle"
+            )
+        # Shielded, so a cancelled caller does not cancel the cycle of all entries.
+        await asyncio.shield(self._cycle_task)
+
+    async def _async_cycle(self) -> None:
+        """Poll all entries, fetching every covering query at most once."""
+        self.cycles += 1
+        self._shared = {}
+        try:
+            results = await asyncio.gather(
+                *(poll() for poll, _ in list(self._pollers.values())),
+                return_exceptions=True,
+            )
+        finally:
+            self._shared = None
+            self._cycle_task = None
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Error polling an entry: %s", result, exc_info=result)
+        self._schedule_cycle()
+
+    async def async_get_controls(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[PoliceGPSControlsResponse]:
+        """Return the controls within a region.
+
+        In a cycle, the query covering the cluster of the region is fetched once, and
+        shared with the other regions of the cluster.
+        """
+        region = (coordinates[0], coordinates[1], radius)
+        if self._shared is None:
+            return await asyncio.shield(self._fetch_task(region))
+        cover = self._covering_region(region)
+        if (task := self._shared.get(cover)) is None:
+            task = self._shared[cover] = self._fetch_task(cover)
+        controls = await asyncio.shield(task)
+        if cover == region:
+            return controls
+        # Keep the filtered list while the shared result is the same object, so an
+        # unchanged response also gives the same filtered list.
+        if (filtered := self._filtered.get(region)) is not None and filtered[0] is controls:
+            return filtered[1]
+        result = [
+            control
+            for control in controls
+            if haversine(region[0], region[1], control.lat, control.lng) <= radius
+        ]
+        self._filtered[region] = (controls, result)
+        return result
+
+    @callback
+    def _fetch_task(
+        self, region: Region
+    ) -> asyncio.Task[list[PoliceGPSControlsResponse]]:
+        """Return the running fetch of a region, starting one if there is none."""
+        if (task := self._pending.get(region)) is None:
+            task = self._hass.async_create_background_task(
+                self._fetch(region), f"politikontroller fetch {region}"
+            )
+            self._pending[region] = task
+            task.add_done_callback(lambda task: self._fetch_done(region, task))
+        return task
+
+    @callback
+    def _fetch_done(
+        self, region: Region, task: asyncio.Task[list[PoliceGPSControlsResponse]]
+    ) -> None:
+        """Forget a finished fetch, and retrieve its error if nobody waits for it."""
+        if self._pending.get(region) is task:
+            del self._pending[region]
+        if not task.cancelled():
+            task.exception()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop the poll cycles, and cancel all pending fetches."""
+        self._pollers.clear()
+        if self._unsub_cycle is not None:
+            self._unsub_cycle()
+            self._unsub_cycle = None
+        if self._cycle_task is not None:
+            self._cycle_task.cancel()
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+    async def _fetch(self, region: Region) -> list[PoliceGPSControlsResponse]:
+        """Fetch the controls within a region."""
+        self.upstream_requests += 1
+        return await self.client.get_controls_in_radius(
+            lat=region[0],
+            lng=region[1],
+            radius=ceil(region[2]),
+        )
+
+    def _covering_region(self, region: Region) -> Region:
+        """Return one region covering all registered regions overlapping a region.
+
+        Only regions registered on their own are merged. The regions of a group are
+        queried as they are, as an enclosing circle would cover far more than them.
+        """
+        singles = [regions[0] for regions in self._regions.values() if len(regions) == 1]
+        if region not in singles:
+            return region
+        cluster = [region]
+        remaining = [other for other in singles if other != region]
+        grown = True
+        while grown:
+            grown = False
+            for other in list(remaining):
+                if any(_overlaps(member, other) for member in cluster):
+                    cluster.append(other)
+                    remaining.remove(other)
+                    grown = True
+        if len(cluster) == 1:
+            return region
+        cluster.sort()
+        lat = sum(member[0] for member in cluster) / len(cluster)
+        lng = sum(member[1] for member in cluster) / len(cluster)
+        radius = max(
+            haversine(lat, lng, member[0], member[1]) + member[2] for member in cluster
+        )
+        # Round the center, so all members of a cluster agree on the same cover.
+        return (round(lat, 6), round(lng, 6), round(radius, 3))
+
+
+def _overlaps(region: Region, other: Region) -> bool:
+    """Return whether two regions overlap."""
+    return haversine(region[0], region[1], other[0], other[1]) < region[2] + other[2]
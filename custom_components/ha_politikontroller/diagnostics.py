@@ -0,0 +1,42 @@
+"""Diagnostics support for the Politikontroller events integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import (
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+)
+
+from .const import CONF_FOLLOW_ENTITY, CONF_ROUTE, CONF_TRACKED_ENTITIES, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .manager import PolitikontrollerFeedEntityManager
+
+TO_REDACT = {
+    CONF_FOLLOW_ENTITY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PASSWORD,
+    CONF_ROUTE,
+    CONF_TRACKED_ENTITIES,
+    CONF_USERNAME,
+    "title",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager: PolitikontrollerFeedEntityManager = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "feed": manager.get_diagnostics(),
+    }
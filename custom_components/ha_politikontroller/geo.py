@@ -0,0 +1,238 @@
+"""Geographic helpers for the Politikontroller events integration."""
+from __future__ import annotations
+
+from math import asin, atan2, ceil, cos, degrees, floor, radians, sin, sqrt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+EARTH_RADIUS_KM = 6371.0088
+GRID_CELL_SIZE = 0.1
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the great-circle distance between two points in kilometers."""
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    a = (
+        sin((phi2 - phi1) / 2) ** 2
+        + cos(phi1) * cos(phi2) * sin(radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def bearing(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the initial bearing from the first to the second point in degrees."""
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    delta = radians(lng2 - lng1)
+    x = sin(delta) * cos(phi2)
+    y = cos(phi1) * sin(phi2) - sin(phi1) * cos(phi2) * cos(delta)
+    return (degrees(atan2(x, y)) + 360) % 360
+
+
+def distances_and_bearings(
+    origin: tuple[float, float],
+    points: Iterable[tuple[float, float]],
+) -> list[tuple[float, float]]:
+    """Return distance in kilometers and bearing from an origin to all points.
+
+    The trigonometry of the origin is computed once for the whole batch.
+    """
+    phi1 = radians(origin[0])
+    lambda1 = radians(origin[1])
+    sin_phi1 = sin(phi1)
+    cos_phi1 = cos(phi1)
+    results = []
+    for lat, lng in points:
+        phi2 = radians(lat)
+        delta = radians(lng) - lambda1
+        sin_phi2 = sin(phi2)
+        cos_phi2 = cos(phi2)
+        a = sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * cos_phi2 * sin(delta / 2) ** 2
+        x = sin(delta) * cos_phi2
+        y = cos_phi1 * sin_phi2 - sin_phi1 * cos_phi2 * cos(delta)
+        results.append(
+            (
+                2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a))),
+                (degrees(atan2(x, y)) + 360) % 360,
+            )
+        )
+    return results
+
+
+class GridIndex:
+    """Spatial index of points in a grid of cells of equal size in degrees."""
+
+    def __init__(self, cell_size: float = GRID_CELL_SIZE) -> None:
+        """Initialize the grid index."""
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = {}
+        self._points: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed points."""
+        return len(self._points)
+
+    def cell(self, lat: float, lng: float) -> tuple[int, int]:
+        """Return the cell containing a point."""
+        return (floor(lat / self._cell_size), floor(lng / self._cell_size))
+
+    def rebuild(self, points: Mapping[str, tuple[float, float]]) -> None:
+        """Replace all indexed points."""
+        self._cells = {}
+        self._points = dict(points)
+        for key, (lat, lng) in self._points.items():
+            self._cells.setdefault(self.cell(lat, lng), {})[key] = (lat, lng)
+
+    def within(self, lat: float, lng: float, radius: float) -> list[tuple[float, str]]:
+        """Return distance and key of all points within a radius in kilometers."""
+        # One degree of latitude is about 111 km, longitude degrees shrink with cos.
+        lat_cells = ceil(radius / (111.0 * self._cell_size))
+        lng_cells = ceil(
+            radius / (111.0 * max(cos(radians(lat)), 0.01) * self._cell_size)
+        )
+        row, col = self.cell(lat, lng)
+        if (2 * lat_cells + 1) * (2 * lng_cells + 1) > len(self._cells):
+            # Scanning the occupied cells is cheaper than scanning the area.
+            cells = list(self._cells.values())
+        else:
+            cells = [
+                self._cells[(cell_row, cell_col)]
+                for cell_row in range(row - lat_cells, row + lat_cells + 1)
+                for cell_col in range(col - lng_cells, col + lng_cells + 1)
+                if (cell_row, cell_col) in self._cells
+            ]
+        results = [
+            (distance, key)
+            for points in cells
+            for key, point in points.items()
+            if (distance := haversine(lat, lng, *point)) <= radius
+        ]
+        results.sort()
+        return results
+
+    def nearest(self, lat: float, lng: float, count: int = 1) -> list[tuple[float, str]]:
+        """Return distance and key of the points nearest to a point."""
+        if not self._points:
+            return []
+        radius = 111.0 * self._cell_size
+        while True:
+            results = self.within(lat, lng, radius)
+            if len(results) >= min(count, len(self._points)):
+                return results[:count]
+            radius *= 2
+
+
+def parse_route(
+    text: str, resolve: Callable[[str], tuple[float, float] | None]
+) -> list[tuple[float, float]]:
+    """Parse a route of one point per line, given as "lat, lng" or an entity id.
+
+    Entity ids, like zones, are turned into points by the resolve callable. Raises
+    ValueError if a line is not a valid point.
+    """
+    points = []
+    for line in text.splitlines():
+        if not (line := line.strip()):
+            continue
+        if "," in line:
+            lat, lng = (float(value) for value in line.split(",", 1))
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):  # noqa: PLR2004
+                msg = f"Coordinates out of range: {line}"
+                raise ValueError(msg)
+            points.append((lat, lng))
+        elif (point := resolve(line)) is not None:
+            points.append(point)
+        else:
+            msg = f"Unknown location: {line}"
+            raise ValueError(msg)
+    return points
+
+
+class Corridor:
+    """Area within a distance in kilometers from a polyline."""
+
+    def __init__(self, points: Sequence[tuple[float, float]], width: float) -> None:
+        """Initialize the corridor, and index its segments in a grid."""
+        if not points:
+            msg = "A corridor needs at least one point"
+            raise ValueError(msg)
+        self.points = list(points)
+        self.width = width
+        if len(self.points) == 1:
+            self.points.append(self.points[0])
+        self._segments = list(zip(self.points, self.points[1:], strict=False))
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        grid = GridIndex()
+        margin_lat = width / 111.0
+        for index, (start, end) in enumerate(self._segments):
+            margin_lng = width / (
+                111.0 * max(cos(radians(max(abs(start[0]), abs(end[0])))), 0.01)
+            )
+            row_min, col_min = grid.cell(
+                min(start[0], end[0]) - margin_lat, min(start[1], end[1]) - margin_lng
+            )
+            row_max, col_max = grid.cell(
+                max(start[0], end[0]) + margin_lat, max(start[1], end[1]) + margin_lng
+            )
+            for row in range(row_min, row_max + 1):
+                for col in range(col_min, col_max + 1):
+                    self._cells.setdefault((row, col), []).append(index)
+        self._grid = grid
+
+    def regions(self, radius: float) -> list[tuple[float, float, float]]:
+        """Return circles of a radius in kilometers that together cover the corridor.
+
+        Centers are placed along the polyline at most 2 * (radius - width) apart, so
+        every point within the width of the polyline is within the radius of a center.
+        """
+        radius = max(radius, 2 * self.width)
+        spacing = 2 * (radius - self.width)
+        centers = [self.points[0]]
+        travelled = 0.0
+        for start, end in self._segments:
+            length = haversine(*start, *end)
+            position = spacing - travelled
+            while position < length:
+                fraction = position / length
+                centers.append(
+                    (
+                        start[0] + (end[0] - start[0]) * fraction,
+                        start[1] + (end[1] - start[1]) * fraction,
+                    )
+                )
+                position += spacing
+            travelled = length - (position - spacing)
+        if travelled > 0:
+            centers.append(self.points[-1])
+        return [(lat, lng, radius) for lat, lng in centers]
+
+    def distance(self, lat: float, lng: float) -> float:
+        """Return the distance in kilometers from a point to the polyline.
+
+        Only segments indexed near the point are considered, so points farther away
+        than the width may return infinity.
+        """
+        best = float("inf")
+        for index in self._cells.get(self._grid.cell(lat, lng), ()):
+            start, end = self._segments[index]
+            # Project to a plane around the point, fine for short distances.
+            scale_lng = 111.32 * cos(radians(lat))
+            ax = (start[1] - lng) * scale_lng
+            ay = (start[0] - lat) * 110.574
+            bx = (end[1] - lng) * scale_lng
+            by = (end[0] - lat) * 110.574
+            dx = bx - ax
+            dy = by - ay
+            length = dx * dx + dy * dy
+            fraction = (
+                0.0 if length == 0 else min(1.0, max(0.0, -(ax * dx + ay * dy) / length))
+            )
+            best = min(best, sqrt((ax + fraction * dx) ** 2 + (ay + fraction * dy) ** 2))
+        return best
+
+    def __contains__(self, point: tuple[float, float]) -> bool:
+        """Return whether a point is within the corridor."""
+        return self.distance(*point) <= self.width
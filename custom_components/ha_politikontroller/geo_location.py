@@ -4,34 +4,31 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from politikontroller_py.models.api import PoliceControlTypeEnum
-
 from homeassistant.components.geo_location import GeolocationEvent
-from homeassistant.const import UnitOfLength
+from homeassistant.const import ATTR_ENTITY_PICTURE, UnitOfLength
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 import homeassistant.util.dt as dt_util
 
 from .const import (
+    ATTR_BEARING,
     ATTR_DESCRIPTION,
-    ATTR_DETAILS,
+    ATTR_STALE,
     ATTR_TYPE,
     ATTRIBUTION,
     DOMAIN,
     SIGNAL_DELETE_ENTITY,
     SIGNAL_UPDATE_ENTITY,
-    URL_BASE,
 )
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-    from politikontroller_py.models import PoliceControlResponse
-
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from . import PolitikontrollerFeedEntityManager
+    from .models import PolitikontrollerControl
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,21 +40,25 @@ async def async_setup_entry(
     manager: PolitikontrollerFeedEntityManager = hass.data[DOMAIN][entry.entry_id]
 
     @callback
-    def async_add_geolocation(
+    def async_add_geolocations(
         feed_manager: PolitikontrollerFeedEntityManager,
-        external_id: str,
+        external_ids: set[str],
     ) -> None:
-        """Add geolocation entity from feed."""
-        new_entity = PolitikontrollerEvent(feed_manager, external_id)
-        _LOGGER.debug("Adding geolocation %s", new_entity)
-        async_add_entities([new_entity], update_before_add=True)
+        """Add geolocation entities from feed."""
+        new_entities = [
+            PolitikontrollerEvent(feed_manager, external_id)
+            for external_id in external_ids
+        ]
+        _LOGGER.debug("Adding %d geolocations", len(new_entities))
+        async_add_entities(new_entities)
 
     manager.listeners.append(
-        async_dispatcher_connect(hass, manager.signal_new_entity, async_add_geolocation)
+        async_dispatcher_connect(hass, manager.signal_new_entity, async_add_geolocations)
     )
-    # Do not wait for update here so that the setup can be completed and because an
-    # update will fetch data from the feed via HTTP and then process that data.
-    entry.async_create_task(hass, manager.async_update())
+    # Entities restored from the stored feed state are added right away, and then
+    # reconciled by the first update.
+    if manager.create_entities and manager.managed_external_ids:
+        async_add_geolocations(manager, manager.managed_external_ids)
     _LOGGER.debug("Geolocation setup done")
 
 
@@ -69,6 +70,11 @@ class PolitikontrollerEvent(GeolocationEvent):
     _attr_unit_of_measurement = UnitOfLength.KILOMETERS
     _attr_attribution = ATTRIBUTION
     _attr_icon = "mdi:map-marker"
+    # Full details are served by the get_control_details service instead, and the
+    # picture follows from the type, and can be an inlined image.
+    _unrecorded_attributes = frozenset(
+        {ATTR_BEARING, ATTR_DESCRIPTION, ATTR_ENTITY_PICTURE}
+    )
     _attr_type: str | None = None
     _attr_description: str | None = None
     _attr_confirmed: bool = False
@@ -86,6 +92,8 @@ class PolitikontrollerEvent(GeolocationEvent):
         self._attr_unique_id = f"{feed_manager.entry_id}_{external_id}"
         self._remove_signal_delete: Callable[[], None] | None = None
         self._remove_signal_update: Callable[[], None] | None = None
+        if feed_entry := feed_manager.get_entry(external_id):
+            self._update_from_feed(feed_entry)
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
@@ -119,25 +127,22 @@ class PolitikontrollerEvent(GeolocationEvent):
         if feed_entry:
             self._update_from_feed(feed_entry)
 
-    def _update_from_feed(self, feed_entry: PoliceControlResponse) -> None:
+    def _update_from_feed(self, feed_entry: PolitikontrollerControl) -> None:
         """Update the internal state from the provided feed entry."""
         self._attr_name = feed_entry.title
         self._attr_latitude = feed_entry.lat
         self._attr_longitude = feed_entry.lng
         self._attr_distance = self._feed_manager.get_distance(self._external_id)
         self._attr_type = feed_entry.type
-        try:
-            pc_type = PoliceControlTypeEnum(feed_entry.type)
-        except ValueError:
-            pc_type = PoliceControlTypeEnum.UNKNOWN
 
         last_updated = feed_entry.last_seen or feed_entry.timestamp
         if last_updated:
             self._attr_last_updated_ts = dt_util.as_local(last_updated).isoformat(timespec="seconds")
 
-        self._attr_entity_picture = f"{URL_BASE}/img/{pc_type.name.lower()}.png"
+        self._attr_entity_picture = self._feed_manager.get_picture(feed_entry.type_name)
         self._attr_extra_state_attributes = {
-            ATTR_TYPE: pc_type.name,
+            ATTR_TYPE: feed_entry.type_name.upper(),
             ATTR_DESCRIPTION: feed_entry.description,
-            ATTR_DETAILS: feed_entry.to_dict(),
+            ATTR_BEARING: round(feed_entry.bearing),
+            ATTR_STALE: self._feed_manager.stale,
         }
@@ -0,0 +1,152 @@
+"""GeoJSON of the current controls for the Politikontroller events integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+import hashlib
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN, URL_BASE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+    from .manager import PolitikontrollerFeedEntityManager
+    from .models import PolitikontrollerControl
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def feature(entry: PolitikontrollerControl, entry_id: str) -> dict[str, Any]:
+    """Return a GeoJSON feature of a control."""
+    properties = entry.as_dict()
+    del properties["lat"], properties["lng"]
+    properties["entry_id"] = entry_id
+    return {
+        "type": "Feature",
+        "id": entry.id,
+        "geometry": {"type": "Point", "coordinates": [entry.lng, entry.lat]},
+        "properties": properties,
+    }
+
+
+def feature_collection(
+    managers: Iterable[PolitikontrollerFeedEntityManager],
+) -> dict[str, Any]:
+    """Return a GeoJSON feature collection of the controls of feed entity managers.
+
+    Controls in more than one feed are only included once.
+    """
+    features: dict[str, dict[str, Any]] = {}
+    stale = False
+    for manager in managers:
+        stale = stale or manager.stale
+        for external_id in manager.managed_external_ids:
+            if external_id not in features and (
+                entry := manager.get_entry(external_id)
+            ) is not None:
+                features[external_id] = feature(entry, manager.entry_id)
+    return {
+        "type": "FeatureCollection",
+        "stale": stale,
+        "features": list(features.values()),
+    }
+
+
+def get_managers(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> list[PolitikontrollerFeedEntityManager] | None:
+    """Return the feed entity managers of one or all config entries.
+
+    Returns None if there is no config entry with the given id.
+    """
+    feeds: dict[str, PolitikontrollerFeedEntityManager] = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return list(feeds.values())
+    if (manager := feeds.get(entry_id)) is None:
+        return None
+    return [manager]
+
+
+@dataclass(slots=True, frozen=True)
+class PolitikontrollerGeoJson:
+    """Serialized GeoJSON document, with its gzip encoding and ETag."""
+
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+class PolitikontrollerGeoJsonView(HomeAssistantView):
+    """View of the current controls as one GeoJSON feature collection.
+
+    The document is only serialized again when the feed of a config entry changed,
+    and can be revalidated with its ETag.
+    """
+
+    url = f"{URL_BASE}/controls.geojson"
+    name = f"api:{DOMAIN}:controls"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._documents: dict[tuple, PolitikontrollerGeoJson] = {}
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the controls of one, or all, config entries."""
+        hass = request.app[KEY_HASS]
+        if (managers := get_managers(hass, request.query.get("entry_id"))) is None:
+            return self.json_message("Config entry not found", HTTPStatus.NOT_FOUND)
+        document = self._document(managers)
+        headers = {
+            hdrs.ETAG: document.etag,
+            hdrs.CACHE_CONTROL: "no-cache",
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == document.etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = document.gzip_body
+        else:
+            body = document.body
+        return web.Response(
+            body=body, content_type="application/geo+json", headers=headers
+        )
+
+    def _document(
+        self, managers: list[PolitikontrollerFeedEntityManager]
+    ) -> PolitikontrollerGeoJson:
+        """Return the document of feed entity managers, serializing it if it changed."""
+        key = tuple(
+            (manager.entry_id, manager.feed_version)
+            for manager in sorted(managers, key=lambda manager: manager.entry_id)
+        )
+        if (document := self._documents.get(key)) is None:
+            body = json_bytes(feature_collection(managers))
+            document = PolitikontrollerGeoJson(
+                body,
+                gzip.compress(body),
+                f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            )
+            # Documents of previous versions of these feeds are dropped.
+            versions = dict(key)
+            self._documents = {
+                other_key: other
+                for other_key, other in self._documents.items()
+                if all(
+                    versions.get(entry_id, version) == version
+                    for entry_id, version in other_key
+                )
+            }
+            self._documents[key] = document
+            _LOGGER.debug("GeoJSON of %d bytes serialized", len(body))
+        return document
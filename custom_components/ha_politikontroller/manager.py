@@ -1,13 +1,20 @@
 """Entity manager for generic Politikontroller events."""
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+import contextlib
+from datetime import timedelta
+import itertools
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 
-from politikontroller_py import Client
 from politikontroller_py.exceptions import AuthenticationError
 
 from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
     CONF_LATITUDE,
     CONF_LONGITUDE,
     CONF_PASSWORD,
@@ -15,35 +22,172 @@ from homeassistant.const import (
     CONF_USERNAME,
     UnitOfLength,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.util import (
-    dt as dt_util,
-    location as loc_util,
-)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
+from .aggregates import PolitikontrollerAggregates
+from .archive import async_get_archive
+from .client import async_get_client_registry
 from .const import (
-    DEFAULT_UPDATE_INTERVAL,
+    ATTR_BEARING,
+    ATTR_DISTANCE,
+    ATTR_EXTERNAL_ID,
+    CHANGE_CHANGED,
+    CHANGE_CREATED,
+    CHANGE_REMOVED,
+    CHANGE_STREAM_QUEUE_SIZE,
+    CIRCUIT_BREAKER_COOLDOWN,
+    CONF_ARCHIVE,
+    CONF_CORRIDOR_WIDTH,
+    CONF_CREATE_ENTITIES,
+    CONF_FOLLOW_ENTITY,
+    CONF_INLINE_ICONS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_ROUTE,
+    CONF_STALE_FAILURES,
+    CONF_TRACKED_ENTITIES,
+    CONF_TYPE_FILTER,
+    CORRIDOR_QUERY_RADIUS_IN_KM,
+    DATA_ICONS,
+    DEFAULT_CORRIDOR_WIDTH_IN_KM,
+    DEFAULT_DETAIL_CACHE_SIZE,
+    DEFAULT_DETAIL_CACHE_TTL,
+    DEFAULT_DETAIL_CONCURRENCY,
+    DEFAULT_DETAIL_RETRIES,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_STALE_FAILURES,
+    DETAIL_RETRY_DELAY,
     DOMAIN,
+    EVENT_CONTROL,
+    FOLLOW_REUSE_FRACTION,
     SIGNAL_DELETE_ENTITY,
+    SIGNAL_FEED_STARTED,
+    SIGNAL_STATUS_UPDATE,
     SIGNAL_UPDATE_ENTITY,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TRACKER_MOVING_DISTANCE_IN_KM,
     UPDATE_ERROR,
     UPDATE_OK,
     UPDATE_OK_NO_DATA,
+    URL_BASE,
+)
+from .geo import Corridor, GridIndex, distances_and_bearings, haversine, parse_route
+from .metrics import (
+    STAGE_DETAILS,
+    STAGE_LIST,
+    STAGE_RECONCILE,
+    STAGE_TOTAL,
+    PolitikontrollerPollMetrics,
+)
+from .models import (
+    PolitikontrollerControl,
+    PolitikontrollerControlChange,
+    control_type_name,
 )
+from .scheduler import PolitikontrollerPollScheduler
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
-    from datetime import datetime
+    from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
 
-    from politikontroller_py.models import PoliceControlResponse
+    from politikontroller_py.models import PoliceGPSControlsResponse
 
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.event import EventStateChangedData
+
+    from .coordinator import PolitikontrollerFetchCoordinator, Region
 
 _LOGGER = logging.getLogger(__name__)
 
+# Feed versions are unique across all feeds, also of reloaded config entries.
+_FEED_VERSIONS = itertools.count()
+
+FINGERPRINT_FIELDS = (
+    "type",
+    "description",
+    "lat",
+    "lng",
+    "timestamp",
+    "last_seen",
+    "speed_limit",
+    "confirmed",
+    "county",
+    "municipality",
+)
+
+
+def fingerprint(entry: PolitikontrollerControl) -> int:
+    """Return a hash of the feed entry fields that are exposed by entities."""
+    return hash(tuple(getattr(entry, field) for field in FINGERPRINT_FIELDS))
+
+
+class PolitikontrollerDetailCache:
+    """LRU cache of control details with a time to live.
+
+    Entries are keyed by control id and the timestamp reported in the control list,
+    so a control is only fetched again when it has changed upstream.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_DETAIL_CACHE_SIZE,
+        ttl: timedelta = DEFAULT_DETAIL_CACHE_TTL,
+    ) -> None:
+        """Initialize the detail cache."""
+        self._entries: OrderedDict[tuple, tuple[float, PolitikontrollerControl]] = (
+            OrderedDict()
+        )
+        self._max_size = max_size
+        self._ttl = ttl.total_seconds()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(control: PoliceGPSControlsResponse) -> tuple:
+        """Return the cache key for a control from the control list."""
+        return (
+            str(control.id),
+            control.timestamp,
+            getattr(control, "last_seen", None),
+        )
+
+    def get(self, key: tuple) -> PolitikontrollerControl | None:
+        """Return cached details, or None if missing or expired."""
+        cached = self._entries.get(key)
+        if cached is None or time.monotonic() - cached[0] > self._ttl:
+            if cached is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached[1]
+
+    def put(self, key: tuple, entry: PolitikontrollerControl) -> None:
+        """Store details, evicting the least recently used entries when full."""
+        self._entries[key] = (time.monotonic(), entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+
 
 class PolitikontrollerFeedManager:
     """Politikontroller Feed Manager."""
@@ -51,79 +195,429 @@ class PolitikontrollerFeedManager:
     def __init__(
         self,
         hass: HomeAssistant,
-        client: Client,
-        generate_async_callback: Callable[[str], Awaitable[None]],
+        coordinator: PolitikontrollerFetchCoordinator | None,
+        generate_async_callback: Callable[[set[str]], Awaitable[None]],
         update_async_callback: Callable[[str], Awaitable[None]],
         remove_async_callback: Callable[[str], Awaitable[None]],
         coordinates: tuple[float, float],
         filter_radius: float,
+        detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+        detail_retries: int = DEFAULT_DETAIL_RETRIES,
+        type_filter: set[str] | None = None,
+        max_failures: int = DEFAULT_STALE_FAILURES,
+        poll_timeout: timedelta = DEFAULT_POLL_TIMEOUT,
+        changes_async_callback: Callable[
+            [set[str], set[str], set[str]], Awaitable[None]
+        ] | None = None,
     ) -> None:
         """Initialise feed manager."""
-        self.feed_entries: dict[str, PoliceControlResponse] = {}
+        self.feed_entries: dict[str, PolitikontrollerControl] = {}
+        self.detail_timings: dict[str, float] = {}
+        self.detail_failures = 0
+        self.detail_cache = PolitikontrollerDetailCache()
+        self.metrics = PolitikontrollerPollMetrics()
+        self.aggregates = PolitikontrollerAggregates(self.feed_entries)
+        self.origin: tuple[float, float] = coordinates
+        self.spatial_index = GridIndex()
+        self.status: str | None = None
+        self.update_counts: dict[str, int] = {}
         self._managed_external_ids = set()
+        self._fingerprints: dict[str, int] = {}
         self._last_update = None
         self._last_update_successful = None
+        self._list_key: tuple | None = None
         self._hass = hass
-        self._client = client
-        self._coordinates = coordinates
-        self._filter_radius = int(filter_radius)
+        self._coordinator = coordinator
+        self.regions: list[Region] = [
+            (coordinates[0], coordinates[1], float(filter_radius))
+        ]
+        self.corridor: Corridor | None = None
+        self._detail_concurrency = max(1, detail_concurrency)
+        self._detail_retries = max(0, detail_retries)
+        self.type_filter: set[str] = type_filter or set()
+        self.max_failures = max_failures
+        self.poll_timeout = poll_timeout
+        self.consecutive_failures = 0
+        self.stale = False
+        self._circuit_open_until = 0.0
         self._generate_async_callback = generate_async_callback
         self._update_async_callback = update_async_callback
         self._remove_async_callback = remove_async_callback
+        self._changes_async_callback = changes_async_callback
+        self._created_external_ids: set[str] = set()
+        self._updated_external_ids: set[str] = set()
+        self._removed_external_ids: set[str] = set()
+
+    @property
+    def coordinator(self) -> PolitikontrollerFetchCoordinator | None:
+        """Return the coordinator used to fetch the feed."""
+        return self._coordinator
+
+    @coordinator.setter
+    def coordinator(self, coordinator: PolitikontrollerFetchCoordinator | None) -> None:
+        """Set the coordinator used to fetch the feed."""
+        self._coordinator = coordinator
+
+    @property
+    def managed_external_ids(self) -> set[str]:
+        """Return the external ids of all managed entities."""
+        return self._managed_external_ids
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a serializable snapshot of the feed state."""
+        return {
+            "entries": [entry.as_list() for entry in self.feed_entries.values()],
+            "managed": list(self._managed_external_ids),
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the feed state from a snapshot."""
+        feed_entries: dict[str, PolitikontrollerControl] = {}
+        for item in data.get("entries", []):
+            try:
+                entry = PolitikontrollerControl.from_list(item)
+            except (TypeError, ValueError) as err:
+                _LOGGER.debug("Skipping invalid stored entry: %s", err)
+                continue
+            feed_entries[entry.id] = entry
+            self.detail_cache.put((entry.id, entry.timestamp, None), entry)
+        self.feed_entries.clear()
+        self.feed_entries.update(feed_entries)
+        self._managed_external_ids = set(data.get("managed", [])).intersection(
+            feed_entries
+        )
+        self.aggregates.reset(self._managed_external_ids)
+        self._fingerprints = {
+            external_id: fingerprint(feed_entries[external_id])
+            for external_id in self._managed_external_ids
+        }
+        self._update_locations()
+        _LOGGER.debug("Restored %d feed entries", len(feed_entries))
 
     async def update(self) -> None:
-        """Update the feed and then update connected entities."""
-        feed_entries = []
-        error = None
-        try:
-            results = await self._client.get_controls_in_radius(
-                lat=self._coordinates[0],
-                lng=self._coordinates[1],
-                radius=self._filter_radius,
-            )
-            _LOGGER.debug("Data retrieved %s", results)
-            status = UPDATE_OK if len(results) > 0 else UPDATE_OK_NO_DATA
-            feed_entries = await self._client.get_controls_from_lists(results)
-        except Exception as err:  # noqa: BLE001
-            status = UPDATE_ERROR
-            error = str(err)
+        """Update the feed and then update connected entities.
+
+        When an update fails, the last good feed entries are kept and marked as stale,
+        until the configured number of consecutive failures is reached. Then all
+        entities are removed, and upstream is not queried again until the circuit
+        breaker cooldown has passed.
+        """
+        start = time.monotonic()
+        self._created_external_ids = set()
+        self._updated_external_ids = set()
+        self._removed_external_ids = set()
+        self.metrics.counters["updates"] += 1
+        status, feed_entries, error = await self._fetch_feed(start)
+        if status is None:
+            await self._update_unchanged(start)
+            return
+        reconcile_start = time.monotonic()
 
         # Record current time of update.
         self._last_update = dt_util.now()
+        self.status = status
         count_created = 0
         count_updated = 0
+        count_unchanged = 0
         count_removed = 0
+        recovered = False
+        if status != UPDATE_ERROR:
+            self.consecutive_failures = 0
+            self._circuit_open_until = 0.0
+            recovered = self.stale
+            self.stale = False
         await self._store_feed_entries(status, feed_entries)
+        self._update_locations()
         if status == UPDATE_OK:
             # Record current time of update.
             self._last_update_successful = self._last_update
             # For entity management the external ids from the feed are used.
-            feed_external_ids = set([str(entry.id) for entry in feed_entries])  # noqa: C403
+            feed_external_ids = set([entry.id for entry in feed_entries])  # noqa: C403
             count_removed = await self._update_feed_remove_entries(feed_external_ids)
-            count_updated = await self._update_feed_update_entries(feed_external_ids)
+            count_updated, count_unchanged = await self._update_feed_update_entries(
+                feed_external_ids
+            )
             count_created = await self._update_feed_create_entries(feed_external_ids)
         elif status == UPDATE_OK_NO_DATA:
             _LOGGER.debug("Update successful, but no data received")
             # Record current time of update.
             self._last_update_successful = self._last_update
         else:
-            _LOGGER.warning("Update not successful, no data received. Error: %s", error)
-            # Remove all entities.
-            count_removed = await self._update_feed_remove_entries(set())
+            count_removed = await self._update_failed(error)
+        if recovered:
+            # Entities need to be updated to no longer be marked as stale.
+            await self._update_entities(
+                self._managed_external_ids - self._updated_external_ids
+            )
+        await self._publish_changes()
+        end = time.monotonic()
+        self.metrics.record(STAGE_RECONCILE, end - reconcile_start)
+        self.metrics.record(STAGE_TOTAL, end - start)
         # Send status update to subscriber.
-        await self._status_update(count_created, count_updated, count_removed)
+        await self._status_update(
+            count_created, count_updated, count_unchanged, count_removed
+        )
+
+    async def _fetch_feed(
+        self, start: float
+    ) -> tuple[str | None, list[PolitikontrollerControl], str | None]:
+        """Fetch the feed entries, and return the status, entries and error.
+
+        The status is None when the control list is unchanged since the last update.
+        """
+        try:
+            if start < self._circuit_open_until:
+                msg = "Circuit breaker is open"
+                raise RuntimeError(msg)  # noqa: TRY301
+            async with asyncio.timeout(self.poll_timeout.total_seconds()):
+                with self.metrics.timed(STAGE_LIST):
+                    sources = await self._list_regions()
+                list_key = (
+                    tuple(self.regions),
+                    frozenset(self.type_filter),
+                    self.corridor,
+                    sources,
+                )
+                if self._list_unchanged(list_key):
+                    return None, [], None
+                self._list_key = None
+                results = self._merge_regions(sources)
+                _LOGGER.debug("Data retrieved %s", results)
+                status = UPDATE_OK if len(results) > 0 else UPDATE_OK_NO_DATA
+                # Drop excluded types before fetching any details.
+                if self.type_filter:
+                    results = [
+                        control
+                        for control in results
+                        if control_type_name(control) not in self.type_filter
+                    ]
+                with self.metrics.timed(STAGE_DETAILS):
+                    feed_entries = await self._fetch_details(results)
+                if not self.detail_failures:
+                    self._list_key = list_key
+        except TimeoutError:
+            self.metrics.errors[STAGE_TOTAL] += 1
+            return UPDATE_ERROR, [], f"No response within {self.poll_timeout}"
+        except Exception as err:  # noqa: BLE001
+            self.metrics.errors[STAGE_TOTAL] += 1
+            return UPDATE_ERROR, [], str(err)
+        return status, feed_entries, None
+
+    async def _update_unchanged(self, start: float) -> None:
+        """Finish an update of an unchanged control list."""
+        # Nothing to parse, diff or dispatch.
+        _LOGGER.debug("Data unchanged since the previous update")
+        self.metrics.counters["unchanged_updates"] += 1
+        self._last_update = self._last_update_successful = dt_util.now()
+        self.metrics.record(STAGE_TOTAL, time.monotonic() - start)
+        await self._status_update(0, 0, len(self._managed_external_ids), 0)
+
+    async def _update_failed(self, error: str | None) -> int:
+        """Keep or remove the entries after a failed update.
+
+        Returns the number of removed entities.
+        """
+        self.consecutive_failures += 1
+        _LOGGER.warning(
+            "Update not successful (%d in a row), no data received. Error: %s",
+            self.consecutive_failures,
+            error,
+        )
+        if self.consecutive_failures >= self.max_failures:
+            if (now := time.monotonic()) >= self._circuit_open_until:
+                _LOGGER.warning(
+                    "Pausing updates for %s after %d failed updates",
+                    CIRCUIT_BREAKER_COOLDOWN,
+                    self.consecutive_failures,
+                )
+                self._circuit_open_until = now + CIRCUIT_BREAKER_COOLDOWN.total_seconds()
+            # Remove all entities.
+            self.stale = False
+            self.feed_entries.clear()
+            self._update_locations()
+            return await self._update_feed_remove_entries(set())
+        if not self.stale:
+            # Keep the last good entries, and mark their entities as stale.
+            self.stale = True
+            await self._update_entities(set(self._managed_external_ids))
+        return 0
+
+    async def _publish_changes(self) -> None:
+        """Pass the ids of created, updated and removed entries to the listener."""
+        if self._changes_async_callback is not None and (
+            self._created_external_ids
+            or self._updated_external_ids
+            or self._removed_external_ids
+        ):
+            await self._changes_async_callback(
+                self._created_external_ids,
+                self._updated_external_ids,
+                self._removed_external_ids,
+            )
+
+    def _list_unchanged(self, list_key: tuple) -> bool:
+        """Return whether the listed controls are the same as in the previous update.
+
+        The lists of unchanged responses are the same objects, so they are compared by
+        identity, and without any parsing.
+        """
+        if (
+            self._list_key is None
+            or self.stale
+            or self.status not in (UPDATE_OK, UPDATE_OK_NO_DATA)
+        ):
+            return False
+        *settings, sources = list_key
+        *previous_settings, previous_sources = self._list_key
+        return (
+            settings == previous_settings
+            and len(sources) == len(previous_sources)
+            and all(
+                source is previous
+                for source, previous in zip(sources, previous_sources, strict=True)
+            )
+        )
+
+    async def _list_regions(self) -> tuple[list[PoliceGPSControlsResponse], ...]:
+        """List the controls in each region.
+
+        Regions are queried through the same bounded pool as details.
+        """
+        semaphore = asyncio.Semaphore(self._detail_concurrency)
+
+        async def list_region(region: Region) -> list[PoliceGPSControlsResponse]:
+            async with semaphore:
+                return await self._coordinator.async_get_controls(
+                    (region[0], region[1]), region[2]
+                )
+
+        return tuple(
+            await asyncio.gather(*(list_region(region) for region in self.regions))
+        )
+
+    def _merge_regions(
+        self, sources: tuple[list[PoliceGPSControlsResponse], ...]
+    ) -> list[PoliceGPSControlsResponse]:
+        """Merge the controls of all regions, within the corridor if one is set.
+
+        Controls found in more than one region are only kept once.
+        """
+        if len(sources) == 1:
+            results = list(sources[0])
+        else:
+            results = list(
+                {
+                    str(control.id): control
+                    for controls in sources
+                    for control in controls
+                }.values()
+            )
+        if self.corridor is not None:
+            results = [
+                control
+                for control in results
+                if (control.lat, control.lng) in self.corridor
+            ]
+        return results
+
+    async def _fetch_details(
+        self,
+        controls: list[PoliceGPSControlsResponse],
+    ) -> list[PolitikontrollerControl]:
+        """Fetch details for all controls through a bounded pool of requests.
+
+        Only controls that are new or changed since they were cached are fetched. Every
+        control is fetched and retried on its own, so a failing control does not fail
+        the whole cycle. If the details of a control cannot be fetched, the entry from
+        the previous cycle is kept when available.
+        """
+        semaphore = asyncio.Semaphore(self._detail_concurrency)
+        self.detail_timings = {}
+        self.detail_failures = 0
+
+        async def fetch(
+            control: PoliceGPSControlsResponse,
+        ) -> PolitikontrollerControl | None:
+            external_id = str(control.id)
+            cache_key = self.detail_cache.key_for(control)
+            if (cached := self.detail_cache.get(cache_key)) is not None:
+                return cached
+            for attempt in range(self._detail_retries + 1):
+                if attempt > 0:
+                    await asyncio.sleep(DETAIL_RETRY_DELAY * attempt)
+                async with semaphore:
+                    start = time.monotonic()
+                    self.metrics.counters["detail_requests"] += 1
+                    try:
+                        entry = PolitikontrollerControl.from_response(
+                            await self._coordinator.client.get_control(control.id)
+                        )
+                    except Exception as err:  # noqa: BLE001
+                        self.metrics.errors[STAGE_DETAILS] += 1
+                        _LOGGER.debug(
+                            "Fetching details for %s failed (attempt %d): %s",
+                            external_id,
+                            attempt + 1,
+                            err,
+                        )
+                    else:
+                        self.detail_cache.put(cache_key, entry)
+                        return entry
+                    finally:
+                        self.detail_timings[external_id] = time.monotonic() - start
+            self.detail_failures += 1
+            return self.feed_entries.get(external_id)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(fetch(control) for control in controls))
+        feed_entries = [entry for entry in results if entry is not None]
+        self.metrics.record_items(STAGE_DETAILS, self.detail_timings.values())
+        _LOGGER.debug(
+            "Fetched details for %d of %d controls (%d requested) in %.3f s",
+            len(feed_entries),
+            len(controls),
+            len(self.detail_timings),
+            time.monotonic() - start,
+        )
+        return feed_entries
 
     async def _store_feed_entries(
         self,
         status: str,
-        feed_entries: list[PoliceControlResponse] | None
+        feed_entries: list[PolitikontrollerControl] | None
     ) -> None:
-        """Keep a copy of all feed entries for future lookups."""
-        if feed_entries or status == UPDATE_OK_NO_DATA:
-            if status == UPDATE_OK:
-                self.feed_entries = {str(entry.id): entry for entry in feed_entries}
-        else:
-            self.feed_entries.clear()
+        """Keep all feed entries for future lookups, updating them in place."""
+        if status != UPDATE_OK:
+            return
+        current = {entry.id: entry for entry in feed_entries}
+        for external_id in self.feed_entries.keys() - current.keys():
+            del self.feed_entries[external_id]
+        for external_id, entry in current.items():
+            if self.feed_entries.get(external_id) is not entry:
+                self.feed_entries[external_id] = entry
+
+    def relocate(self, origin: tuple[float, float]) -> None:
+        """Move the origin, and recompute distance and bearing of all feed entries."""
+        self.origin = origin
+        self._update_locations(reindex=False)
+
+    def _update_locations(self, *, reindex: bool = True) -> None:
+        """Compute distance and bearing from the origin, and index all feed entries."""
+        entries = list(self.feed_entries.values())
+        for entry, (distance, bearing) in zip(
+            entries,
+            distances_and_bearings(
+                self.origin, ((entry.lat, entry.lng) for entry in entries)
+            ),
+            strict=True,
+        ):
+            entry.distance = distance
+            entry.bearing = bearing
+        if not reindex:
+            return
+        self.spatial_index.rebuild(
+            {entry.id: (entry.lat, entry.lng) for entry in entries}
+        )
 
     async def _update_feed_create_entries(self, feed_external_ids: set[str]) -> int:
         """Create entities after feed update."""
@@ -132,12 +626,23 @@ class PolitikontrollerFeedManager:
         await self._generate_new_entities(create_external_ids)
         return count_created
 
-    async def _update_feed_update_entries(self, feed_external_ids: set[str]) -> int:
-        """Update entities after feed update."""
-        update_external_ids = self._managed_external_ids.intersection(feed_external_ids)
-        count_updated = len(update_external_ids)
+    async def _update_feed_update_entries(
+        self, feed_external_ids: set[str]
+    ) -> tuple[int, int]:
+        """Update entities whose feed entry changed after feed update."""
+        update_external_ids = set()
+        count_unchanged = 0
+        for external_id in self._managed_external_ids.intersection(feed_external_ids):
+            entry_fingerprint = fingerprint(self.feed_entries[external_id])
+            if self._fingerprints.get(external_id) == entry_fingerprint:
+                count_unchanged += 1
+                continue
+            self._fingerprints[external_id] = entry_fingerprint
+            self.aggregates.add(self.feed_entries[external_id])
+            update_external_ids.add(external_id)
+        self._updated_external_ids |= update_external_ids
         await self._update_entities(update_external_ids)
-        return count_updated
+        return len(update_external_ids), count_unchanged
 
     async def _update_feed_remove_entries(self, feed_external_ids: set[str]) -> int:
         """Remove entities after feed update."""
@@ -147,11 +652,15 @@ class PolitikontrollerFeedManager:
         return count_removed
 
     async def _generate_new_entities(self, external_ids: set[str]) -> None:
-        """Generate new entities for events using callback."""
+        """Generate new entities for events using callback, in a single batch."""
         for external_id in external_ids:
-            await self._generate_async_callback(external_id)
             _LOGGER.debug("New entity added %s", external_id)
             self._managed_external_ids.add(external_id)
+            self._fingerprints[external_id] = fingerprint(self.feed_entries[external_id])
+            self.aggregates.add(self.feed_entries[external_id])
+        self._created_external_ids |= external_ids
+        if external_ids:
+            await self._generate_async_callback(external_ids)
 
     async def _update_entities(self, external_ids: set[str]) -> None:
         """Update entities using callback."""
@@ -164,13 +673,32 @@ class PolitikontrollerFeedManager:
         for external_id in external_ids:
             _LOGGER.debug("Entity not current anymore %s", external_id)
             self._managed_external_ids.remove(external_id)
+            self._fingerprints.pop(external_id, None)
+            self.aggregates.remove(external_id)
+            self._removed_external_ids.add(external_id)
             await self._remove_async_callback(external_id)
 
     async def _status_update(
-        self, count_created: int, count_updated: int, count_removed: int
+        self,
+        count_created: int,
+        count_updated: int,
+        count_unchanged: int,
+        count_removed: int,
     ) -> None:
         """Provide status update."""
-        _LOGGER.debug("Update status: %d created, %d updated, %d removed", count_created, count_updated, count_removed)
+        self.update_counts = {
+            "created": count_created,
+            "updated": count_updated,
+            "unchanged": count_unchanged,
+            "removed": count_removed,
+        }
+        _LOGGER.debug(
+            "Update status: %d created, %d updated, %d unchanged, %d removed",
+            count_created,
+            count_updated,
+            count_unchanged,
+            count_removed,
+        )
 
 
 class PolitikontrollerFeedEntityManager:
@@ -183,14 +711,14 @@ class PolitikontrollerFeedEntityManager:
     ) -> None:
         """Initialize the Politikontroller Feed Manager."""
         self._hass: HomeAssistant = hass
-        self._client = Client()
         self._config = config_entry.data
+        self._options = config_entry.options
         self.entry_id: str = config_entry.entry_id
 
         self._feed_manager = PolitikontrollerFeedManager(
             self._hass,
-            self._client,
-            self._generate_entity,
+            None,
+            self._generate_entities,
             self._update_entity,
             self._remove_entity,
             (
@@ -198,77 +726,629 @@ class PolitikontrollerFeedEntityManager:
                 self._config[CONF_LONGITUDE],
             ),
             self._config[CONF_RADIUS],
+            type_filter=set(self._options.get(CONF_TYPE_FILTER, [])),
+            max_failures=self._options.get(
+                CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES
+            ),
+            poll_timeout=self._poll_timeout(),
+            changes_async_callback=self._publish_changes,
         )
 
-        self._track_time_remove_callback: Callable[[], None] | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(config_entry.entry_id)
+        )
+        self._scheduler = PolitikontrollerPollScheduler(*self._interval_bounds())
+        self._tracker_positions: dict[str, tuple[float, float]] = {}
+        self._change_queues: set[
+            asyncio.Queue[PolitikontrollerControlChange | None]
+        ] = set()
+        self._change_listeners: list[
+            Callable[[set[str], set[str], set[str]], None]
+        ] = []
+        self._stop_listeners: list[Callable[[], None]] = []
+        self.feed_version = next(_FEED_VERSIONS)
+        self._remove_poller: Callable[[], None] | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+        self._stopping = False
+        self.setup_duration: float | None = None
+        self._unregister_region: Callable[[], None] | None = None
+        self._unsub_follow: Callable[[], None] | None = None
+        self._query_center: tuple[float, float] | None = None
         self.listeners: list[Callable[[], None]] = []
         self.signal_new_entity: str = (
             f"{DOMAIN}_new_geolocation_{config_entry.entry_id}"
         )
+        self.signal_status_update: str = SIGNAL_STATUS_UPDATE.format(
+            config_entry.entry_id
+        )
 
-    async def async_init(self) -> None:
-        """Schedule initial and regular updates based on configured time interval."""
-
-        async def update(event_time: datetime) -> None:  # noqa: ARG001
-            """Update."""
-            await self.async_update()
+    def _interval_bounds(self) -> tuple[timedelta, timedelta]:
+        """Return the configured bounds of the update interval."""
+        return (
+            timedelta(
+                seconds=self._options.get(
+                    CONF_MIN_UPDATE_INTERVAL,
+                    DEFAULT_MIN_UPDATE_INTERVAL.total_seconds(),
+                )
+            ),
+            timedelta(
+                seconds=self._options.get(
+                    CONF_MAX_UPDATE_INTERVAL,
+                    DEFAULT_MAX_UPDATE_INTERVAL.total_seconds(),
+                )
+            ),
+        )
 
-        # Trigger updates at regular intervals.
-        self._track_time_remove_callback = async_track_time_interval(
-            self._hass, update, DEFAULT_UPDATE_INTERVAL
+    def _poll_timeout(self) -> timedelta:
+        """Return the configured deadline of a poll."""
+        return timedelta(
+            seconds=self._options.get(
+                CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT.total_seconds()
+            )
         )
 
-        # Authenticate
+    async def async_init(self) -> None:
+        """Authenticate, and register the regions to query."""
+        # Authenticate, sharing the client with other entries for the same account.
         try:
-            await self._client.authenticate_user(
+            coordinator = await async_get_client_registry(self._hass).async_acquire(
                 username=self._config[CONF_USERNAME],
                 password=self._config[CONF_PASSWORD],
             )
         except AuthenticationError as err:
             _LOGGER.exception("Error authenticating politikontroller account.")
             raise ConfigEntryAuthFailed from err
-
+        self._feed_manager.coordinator = coordinator
+        self._archive_current()
+        self._configure_area()
+        self._follow()
         _LOGGER.debug("Feed entity manager initialized")
 
+    @callback
+    def async_start(self) -> None:
+        """Update right away, and then in the poll cycles of the account.
+
+        The account is polled when the first of its entries is due, by the adaptive
+        interval of each entry.
+        """
+        if (coordinator := self._feed_manager.coordinator) is None:
+            return
+        self._remove_poller = coordinator.async_add_poller(
+            self.async_update, self._scheduler.next_delay
+        )
+        self._async_start_poll()
+        # Subscriptions to all feeds pick up new and reloaded feeds.
+        async_dispatcher_send(self._hass, SIGNAL_FEED_STARTED, self)
+
+    @property
+    def archiving(self) -> bool:
+        """Return whether the controls of the feed are archived."""
+        return self._options.get(CONF_ARCHIVE, False)
+
+    @callback
+    def _archive_current(self) -> None:
+        """Archive the current controls, if archiving is enabled."""
+        if self.archiving:
+            async_get_archive(self._hass).async_record(
+                (self.get_entry(external_id) for external_id in self.managed_external_ids),
+                (),
+            )
+
+    @callback
+    def _configure_area(self) -> None:
+        """Set the regions to query, covering the configured route if there is one."""
+        corridor = None
+        if route := self._options.get(CONF_ROUTE):
+            try:
+                corridor = Corridor(
+                    parse_route(route, self._resolve_location),
+                    self._options.get(
+                        CONF_CORRIDOR_WIDTH, DEFAULT_CORRIDOR_WIDTH_IN_KM
+                    ),
+                )
+            except ValueError as err:
+                _LOGGER.warning("Invalid route, using the configured location: %s", err)
+        self._feed_manager.corridor = corridor
+        position = self._follow_position()
+        if corridor is not None:
+            regions = corridor.regions(CORRIDOR_QUERY_RADIUS_IN_KM)
+            _LOGGER.debug("Covering route with %d regions", len(regions))
+            self._query_center = None
+        else:
+            # Follow the entity if there is one, else use the configured location.
+            self._query_center = position
+            center = position or (self._config[CONF_LATITUDE], self._config[CONF_LONGITUDE])
+            regions = [(center[0], center[1], float(self._config[CONF_RADIUS]))]
+        self._set_regions(regions)
+        # Distances are from the followed entity, or else from the configured location.
+        self._feed_manager.relocate(
+            position or (self._config[CONF_LATITUDE], self._config[CONF_LONGITUDE])
+        )
+
+    @callback
+    def _set_regions(self, regions: list[Region]) -> None:
+        """Set the regions to query, and register them with the coordinator."""
+        self._feed_manager.regions = regions
+        if self._unregister_region:
+            self._unregister_region()
+            self._unregister_region = None
+        if (coordinator := self._feed_manager.coordinator) is not None:
+            self._unregister_region = coordinator.async_register_regions(regions)
+
+    @callback
+    def _move_query_center(self) -> bool:
+        """Center the query on the followed entity, if it left the reuse zone.
+
+        Returns whether the query center was moved.
+        """
+        if self._feed_manager.corridor is not None:
+            return False
+        if (position := self._follow_position()) is None:
+            return False
+        radius = float(self._config[CONF_RADIUS])
+        if (
+            self._query_center is not None
+            and haversine(*self._query_center, *position)
+            <= radius * FOLLOW_REUSE_FRACTION
+        ):
+            return False
+        self._query_center = position
+        self._set_regions([(position[0], position[1], radius)])
+        return True
+
+    @callback
+    def _follow(self) -> None:
+        """Listen to position changes of the followed entity, if there is one."""
+        if self._unsub_follow:
+            self._unsub_follow()
+            self._unsub_follow = None
+        if (entity_id := self._options.get(CONF_FOLLOW_ENTITY)) is None:
+            return
+        self._unsub_follow = async_track_state_change_event(
+            self._hass, [entity_id], self._async_followed_entity_moved
+        )
+
+    @callback
+    def _async_followed_entity_moved(
+        self,
+        event: Event[EventStateChangedData],  # noqa: ARG002
+    ) -> None:
+        """Recompute distances locally, and only query again outside the reuse zone."""
+        if (position := self._follow_position()) is None:
+            return
+        if position == self._feed_manager.origin:
+            return
+        shown = self._shown_locations()
+        self._feed_manager.relocate(position)
+        if self.create_entities:
+            # Only entities showing another distance or bearing write their state.
+            for external_id, location in self._shown_locations().items():
+                if shown.get(external_id) != location:
+                    async_dispatcher_send(
+                        self._hass, SIGNAL_UPDATE_ENTITY.format(external_id)
+                    )
+        # The nearest control may have changed.
+        async_dispatcher_send(self._hass, self.signal_status_update)
+        if self._move_query_center() and self._remove_poller is not None:
+            # Fetch the new area now, instead of waiting for the next cycle.
+            self._async_start_poll()
+
+    def _shown_locations(self) -> dict[str, tuple[float, int]]:
+        """Return distance and bearing of the managed entries, rounded like entities.
+
+        The state of a geolocation entity is its distance rounded to one decimal.
+        """
+        return {
+            external_id: (
+                round(self.get_distance(external_id), 1),
+                round(self.get_bearing(external_id)),
+            )
+            for external_id in self.managed_external_ids
+        }
+
+    def _follow_position(self) -> tuple[float, float] | None:
+        """Return the position of the followed entity, if there is one."""
+        if (entity_id := self._options.get(CONF_FOLLOW_ENTITY)) is None:
+            return None
+        return self._resolve_location(entity_id)
+
+    def _resolve_location(self, entity_id: str) -> tuple[float, float] | None:
+        """Return the location of an entity, like a zone."""
+        if (state := self._hass.states.get(entity_id)) is None:
+            return None
+        latitude = state.attributes.get(ATTR_LATITUDE)
+        longitude = state.attributes.get(ATTR_LONGITUDE)
+        if latitude is None or longitude is None:
+            return None
+        return (latitude, longitude)
+
+    @property
+    def current_interval(self) -> timedelta:
+        """Return the current update interval."""
+        return self._scheduler.interval
+
+    @property
+    def managed_external_ids(self) -> set[str]:
+        """Return the external ids of all managed entities."""
+        return self._feed_manager.managed_external_ids
+
+    @property
+    def metrics(self) -> PolitikontrollerPollMetrics:
+        """Return the poll metrics."""
+        return self._feed_manager.metrics
+
+    @property
+    def detail_cache(self) -> PolitikontrollerDetailCache:
+        """Return the detail cache."""
+        return self._feed_manager.detail_cache
+
+    @property
+    def coordinator(self) -> PolitikontrollerFetchCoordinator | None:
+        """Return the coordinator used to fetch the feed."""
+        return self._feed_manager.coordinator
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Return diagnostics of the feed."""
+        feed_manager = self._feed_manager
+        cache = feed_manager.detail_cache
+        diagnostics: dict[str, Any] = {
+            "status": feed_manager.status,
+            "setup_duration": self.setup_duration,
+            "stale": feed_manager.stale,
+            "consecutive_failures": feed_manager.consecutive_failures,
+            "current_interval": self.current_interval.total_seconds(),
+            "entries": len(feed_manager.feed_entries),
+            "entry_size": (
+                sum(entry.size() for entry in feed_manager.feed_entries.values())
+                // len(feed_manager.feed_entries)
+                if feed_manager.feed_entries
+                else None
+            ),
+            "managed_entities": len(feed_manager.managed_external_ids),
+            "regions": len(feed_manager.regions),
+            "update_counts": feed_manager.update_counts,
+            "detail_cache": {
+                "size": len(cache),
+                "hits": cache.hits,
+                "misses": cache.misses,
+            },
+            "detail_failures": feed_manager.detail_failures,
+            "metrics": feed_manager.metrics.as_dict(),
+        }
+        if (coordinator := feed_manager.coordinator) is not None:
+            diagnostics["upstream"] = {
+                "list_requests": coordinator.upstream_requests,
+                "requests": coordinator.client.request_count,
+                "characters_received": coordinator.client.characters_received,
+                "unchanged_responses": coordinator.client.unchanged_responses,
+            }
+        return diagnostics
+
+    @property
+    def stale(self) -> bool:
+        """Return whether the feed entries are kept from before a failed update."""
+        return self._feed_manager.stale
+
+    async def async_restore(self) -> None:
+        """Restore the feed state stored before the last shutdown."""
+        if (data := await self._store.async_load()) is not None:
+            self._feed_manager.restore(data)
+
+    @property
+    def create_entities(self) -> bool:
+        """Return whether entities are created for the feed entries."""
+        return self._options.get(CONF_CREATE_ENTITIES, True)
+
+    async def async_update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply changed options without reloading, and refresh data."""
+        create_entities = self.create_entities
+        inline_icons = self._options.get(CONF_INLINE_ICONS, False)
+        self._options = options
+        if create_entities and not self.create_entities:
+            # Removing entities is a no-op once they are no longer created, so the
+            # signals are sent directly.
+            for external_id in self.managed_external_ids:
+                async_dispatcher_send(
+                    self._hass, SIGNAL_DELETE_ENTITY.format(external_id)
+                )
+        elif not create_entities and self.create_entities and self.managed_external_ids:
+            await self._generate_entities(set(self.managed_external_ids))
+        elif inline_icons != options.get(CONF_INLINE_ICONS, False):
+            for external_id in self.managed_external_ids:
+                await self._update_entity(external_id)
+        self._feed_manager.type_filter = set(options.get(CONF_TYPE_FILTER, []))
+        self._feed_manager.max_failures = options.get(
+            CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES
+        )
+        self._feed_manager.poll_timeout = self._poll_timeout()
+        self._archive_current()
+        self._scheduler.set_bounds(*self._interval_bounds())
+        self._tracker_positions.clear()
+        self._configure_area()
+        self._follow()
+        _LOGGER.debug("Feed entity manager options updated")
+        if self._poll_task is not None and not self._poll_task.done():
+            # A running poll uses the previous options, so poll again after it.
+            await asyncio.shield(self._poll_task)
+        await self.async_update()
+
     async def async_update(self) -> None:
-        """Refresh data."""
+        """Refresh data, or wait for the refresh that is already running."""
+        if self._feed_manager.coordinator is None or self._stopping:
+            _LOGGER.debug("Feed entity manager not initialized, skipping update")
+            return
+        # Shielded, so a cancelled caller does not cancel the poll shared with others.
+        await asyncio.shield(self._async_start_poll())
+
+    @callback
+    def _async_start_poll(self) -> asyncio.Task[None]:
+        """Start a poll, unless one is already running, and return the poll."""
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = self._hass.async_create_background_task(
+                self._async_poll(), f"{DOMAIN} update {self.entry_id}"
+            )
+        else:
+            _LOGGER.debug("Update already running, waiting for it")
+        return self._poll_task
+
+    async def _async_poll(self) -> None:
+        """Poll the feed once."""
+        self._move_query_center()
+        stale = self._feed_manager.stale
         await self._feed_manager.update()
+        if self._feed_manager.stale != stale:
+            self._notify_change_listeners(set(), set(), set())
+        counts = self._feed_manager.update_counts
+        self._scheduler.record_update(
+            counts.get("created", 0) + counts.get("updated", 0) + counts.get("removed", 0),
+            len(self._feed_manager.feed_entries),
+            error=self._feed_manager.status == UPDATE_ERROR,
+            moving=self._trackers_moving(),
+        )
+        _LOGGER.debug("Next update due in about %s", self._scheduler.interval)
+        async_dispatcher_send(self._hass, self.signal_status_update)
+        self._store.async_delay_save(self._feed_manager.snapshot, STORAGE_SAVE_DELAY)
         _LOGGER.debug("Feed entity manager updated")
 
     async def async_stop(self) -> None:
-        """Stop this feed entity manager from refreshing."""
+        """Stop this feed entity manager from refreshing, cancelling a running poll."""
+        self._stopping = True
+        if self._remove_poller:
+            self._remove_poller()
+            self._remove_poller = None
+        if self._poll_task is not None and not self._poll_task.done():
+            start = time.monotonic()
+            self._poll_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._poll_task
+            _LOGGER.debug(
+                "Running update cancelled in %.3f s", time.monotonic() - start
+            )
+        self._poll_task = None
+        for queue in self._change_queues:
+            # End the change streams, making room for the end marker if needed.
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        # No more changes are sent, so the change listeners are told to end.
+        self._change_listeners.clear()
+        stop_listeners, self._stop_listeners = self._stop_listeners, []
+        for stop_listener in stop_listeners:
+            stop_listener()
         for unsub_dispatcher in self.listeners:
             unsub_dispatcher()
         self.listeners = []
-        if self._track_time_remove_callback:
-            self._track_time_remove_callback()
+        if self._unsub_follow:
+            self._unsub_follow()
+            self._unsub_follow = None
+        if self._unregister_region:
+            self._unregister_region()
+            self._unregister_region = None
+        if self._feed_manager.coordinator is not None:
+            self._feed_manager.coordinator = None
+            async_get_client_registry(self._hass).async_release(
+                self._config[CONF_USERNAME]
+            )
         _LOGGER.debug("Feed entity manager stopped")
 
-    def get_entry(self, external_id: str) -> PoliceControlResponse | None:
+    def _trackers_moving(self) -> bool:
+        """Return whether any tracked entity has moved since the previous update."""
+        moving = False
+        entity_ids = list(self._options.get(CONF_TRACKED_ENTITIES, []))
+        if (follow_entity_id := self._options.get(CONF_FOLLOW_ENTITY)) is not None:
+            entity_ids.append(follow_entity_id)
+        for entity_id in entity_ids:
+            if (position := self._resolve_location(entity_id)) is None:
+                continue
+            previous = self._tracker_positions.get(entity_id)
+            self._tracker_positions[entity_id] = position
+            if (
+                previous is not None
+                and haversine(*previous, *position) > TRACKER_MOVING_DISTANCE_IN_KM
+            ):
+                moving = True
+        return moving
+
+    def get_entry(self, external_id: str) -> PolitikontrollerControl | None:
         """Get feed entry by external id."""
         return self._feed_manager.feed_entries.get(external_id)
 
+    def get_details(self, external_id: str) -> dict[str, Any] | None:
+        """Get all details of feed entry."""
+        if (entry := self.get_entry(external_id)) is None:
+            return None
+        return {
+            **entry.as_dict(),
+            ATTR_DISTANCE: self.get_distance(external_id),
+            ATTR_BEARING: entry.bearing,
+        }
+
+    def get_picture(self, type_name: str) -> str:
+        """Get the picture of a control type."""
+        if (icons := self._hass.data.get(DATA_ICONS)) is None:
+            return f"{URL_BASE}/img/{type_name}.png"
+        return icons.url(type_name, inline=self._options.get(CONF_INLINE_ICONS, False))
+
     def get_distance(self, external_id: str) -> float:
         """Get distance to feed entry."""
-        entry = self.get_entry(external_id)
-        return self._hass.config.units.length(
-            loc_util.distance(self._hass.config.latitude, self._hass.config.longitude, entry.lat, entry.lng),
-            UnitOfLength.METERS
+        entry = self._feed_manager.feed_entries[external_id]
+        return self._hass.config.units.length(entry.distance, UnitOfLength.KILOMETERS)
+
+    def get_bearing(self, external_id: str) -> float:
+        """Get bearing to feed entry."""
+        return self._feed_manager.feed_entries[external_id].bearing
+
+    @property
+    def type_counts(self) -> Mapping[str, int]:
+        """Return the number of managed feed entries per control type."""
+        return self._feed_manager.aggregates.type_counts
+
+    @property
+    def newest(self) -> PolitikontrollerControl | None:
+        """Return the managed feed entry with the latest timestamp."""
+        return self._feed_manager.aggregates.newest
+
+    def nearest(self, count: int = 1) -> list[tuple[float, str]]:
+        """Get distance in kilometers and external id of the nearest feed entries."""
+        return self._feed_manager.spatial_index.nearest(
+            *self._feed_manager.origin, count
         )
 
-    async def _generate_entity(self, external_id: str) -> None:
-        """Generate new entity."""
+    def within(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[tuple[float, str]]:
+        """Get distance in kilometers and external id of feed entries in a radius."""
+        return self._feed_manager.spatial_index.within(*coordinates, radius)
+
+    async def async_stream_changes(self) -> AsyncIterator[PolitikontrollerControlChange]:
+        """Iterate over changes of controls in the feed, until the feed is stopped."""
+        if self._stopping:
+            # The end of the streams was already sent.
+            return
+        queue: asyncio.Queue[PolitikontrollerControlChange | None] = asyncio.Queue(
+            CHANGE_STREAM_QUEUE_SIZE
+        )
+        self._change_queues.add(queue)
+        try:
+            while (change := await queue.get()) is not None:
+                yield change
+        finally:
+            self._change_queues.discard(queue)
+
+    @callback
+    def async_add_change_listener(
+        self,
+        listener: Callable[[set[str], set[str], set[str]], None],
+        stop_listener: Callable[[], None] | None = None,
+    ) -> Callable[[], None]:
+        """Listen to the ids of created, updated and removed controls of each update.
+
+        Listeners are also called, without ids, when the stale state changes. The stop
+        listener is called once the feed is stopped, after which no more changes are
+        sent.
+        """
+        self._change_listeners.append(listener)
+        if stop_listener is not None:
+            self._stop_listeners.append(stop_listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._change_listeners:
+                self._change_listeners.remove(listener)
+            if stop_listener in self._stop_listeners:
+                self._stop_listeners.remove(stop_listener)
+
+        return remove_listener
+
+    @callback
+    def _notify_change_listeners(
+        self, created: set[str], updated: set[str], removed: set[str]
+    ) -> None:
+        """Mark the feed as changed, and call the change listeners."""
+        self.feed_version = next(_FEED_VERSIONS)
+        for listener in list(self._change_listeners):
+            listener(created, updated, removed)
+
+    async def _publish_changes(
+        self, created: set[str], updated: set[str], removed: set[str]
+    ) -> None:
+        """Fire events, feed change streams, and archive changed controls."""
+        self._notify_change_listeners(created, updated, removed)
+        if self.archiving:
+            async_get_archive(self._hass).async_record(
+                (
+                    entry
+                    for external_id in created
+                    if (entry := self.get_entry(external_id)) is not None
+                ),
+                self._removed_everywhere(removed),
+            )
+        for kind, external_ids in (
+            (CHANGE_CREATED, created),
+            (CHANGE_CHANGED, updated),
+            (CHANGE_REMOVED, removed),
+        ):
+            for external_id in external_ids:
+                entry = self.get_entry(external_id) if kind != CHANGE_REMOVED else None
+                event_data = {"entry_id": self.entry_id, ATTR_EXTERNAL_ID: external_id}
+                if entry is not None:
+                    event_data.update(self.get_details(external_id))
+                self._hass.bus.async_fire(EVENT_CONTROL.format(kind), event_data)
+                change = PolitikontrollerControlChange(kind, external_id, entry)
+                for queue in self._change_queues:
+                    if queue.full():
+                        _LOGGER.warning("Change stream is full, dropping %s", change)
+                    else:
+                        queue.put_nowait(change)
+
+    def _removed_everywhere(self, removed: set[str]) -> set[str]:
+        """Return the removed controls that no other archiving feed still tracks.
+
+        The archive is shared by all config entries, so a control is only last seen
+        once it has left every archiving feed.
+        """
+        others = [
+            entity_manager.managed_external_ids
+            for entity_manager in self._hass.data.get(DOMAIN, {}).values()
+            if entity_manager is not self and entity_manager.archiving
+        ]
+        return {
+            external_id
+            for external_id in removed
+            if not any(external_id in managed for managed in others)
+        }
+
+    async def _generate_entities(self, external_ids: set[str]) -> None:
+        """Generate new entities."""
+        if not self.create_entities:
+            return
         async_dispatcher_send(
             self._hass,
             self.signal_new_entity,
             self,
-            external_id,
+            external_ids,
         )
 
     async def _update_entity(self, external_id: str) -> None:
         """Update entity."""
+        if not self.create_entities:
+            return
         async_dispatcher_send(self._hass, SIGNAL_UPDATE_ENTITY.format(external_id))
 
     async def _remove_entity(self, external_id: str) -> None:
         """Remove entity."""
+        if not self.create_entities:
+            return
         async_dispatcher_send(self._hass, SIGNAL_DELETE_ENTITY.format(external_id))
+
+
+@callback
+def async_get_control_details(
+    hass: HomeAssistant, external_id: str
+) -> dict[str, Any] | None:
+    """Get all details of a control from any of the feed entity managers."""
+    entity_managers: dict[str, PolitikontrollerFeedEntityManager] = hass.data.get(DOMAIN, {})
+    for entity_manager in entity_managers.values():
+        if (details := entity_manager.get_details(external_id)) is not None:
+            return details
+    return None
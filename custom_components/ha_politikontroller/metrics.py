@@ -0,0 +1,88 @@
+"""Poll metrics for the Politikontroller events integration."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from contextlib import contextmanager
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import METRICS_WINDOW
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+STAGE_LIST = "list"
+STAGE_DETAILS = "details"
+STAGE_RECONCILE = "reconcile"
+STAGE_TOTAL = "total"
+
+
+class PolitikontrollerPollMetrics:
+    """Rolling latencies of poll stages, and counters of requests and errors.
+
+    Stages that handle items one by one, like fetching details, also keep the latency
+    of every item of their latest run, to show how the stage scales with the items.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """Initialize the poll metrics."""
+        self._window = window
+        self.stage_latencies: dict[str, deque[float]] = {}
+        self.item_latencies: dict[str, list[float]] = {}
+        self.counters: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the latency of a stage."""
+        if stage not in self.stage_latencies:
+            self.stage_latencies[stage] = deque(maxlen=self._window)
+        self.stage_latencies[stage].append(seconds)
+
+    def record_items(self, stage: str, seconds: Iterable[float]) -> None:
+        """Record the latencies of the items of the latest run of a stage."""
+        self.item_latencies[stage] = list(seconds)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record the latency of a stage, and count it as an error if it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.errors[stage] += 1
+            raise
+        finally:
+            self.record(stage, time.monotonic() - start)
+
+    def last(self, stage: str) -> float | None:
+        """Return the latest latency of a stage."""
+        if latencies := self.stage_latencies.get(stage):
+            return latencies[-1]
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the metrics."""
+        return {
+            "stages": {
+                stage: _summarize(latencies)
+                for stage, latencies in self.stage_latencies.items()
+            },
+            "items": {
+                stage: _summarize(latencies) if latencies else {"count": 0}
+                for stage, latencies in self.item_latencies.items()
+            },
+            "counters": dict(self.counters),
+            "errors": dict(self.errors),
+        }
+
+
+def _summarize(latencies: Sequence[float]) -> dict[str, float | int]:
+    """Return count and percentiles of latencies in seconds."""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "last": round(latencies[-1], 4),
+        "p50": round(ordered[len(ordered) // 2], 4),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max": round(ordered[-1], 4),
+    }
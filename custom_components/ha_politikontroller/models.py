@@ -0,0 +1,174 @@
+"""Models for the Politikontroller events integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import sys
+from typing import TYPE_CHECKING, Any
+
+from politikontroller_py.constants import (
+    DESCRIPTION_TRUNCATE_LENGTH,
+    DESCRIPTION_TRUNCATE_SUFFIX,
+)
+from politikontroller_py.models.api import PoliceControlTypeEnum
+
+if TYPE_CHECKING:
+    from politikontroller_py.models import (
+        PoliceControlResponse,
+        PoliceGPSControlsResponse,
+    )
+
+
+def control_type_name(control: PoliceGPSControlsResponse | PoliceControlResponse) -> str:
+    """Return the name of the type of a control, as used by the type filter."""
+    try:
+        return PoliceControlTypeEnum(control.type).name.lower()
+    except ValueError:
+        return PoliceControlTypeEnum.UNKNOWN.name.lower()
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    """Return a datetime as a unix timestamp."""
+    return int(value.timestamp()) if value is not None else None
+
+
+def _datetime(value: int | None) -> datetime | None:
+    """Return a unix timestamp as a datetime, the same way as the API models."""
+    return datetime.fromtimestamp(value) if value is not None else None  # noqa: DTZ006
+
+
+@dataclass(slots=True)
+class PolitikontrollerControl:
+    """Compact record of a police control, with only the fields used here.
+
+    Strings shared by many controls are interned, and the distance and bearing from
+    the origin are kept with the record.
+    """
+
+    id: str  # noqa: A003
+    type: str  # noqa: A003
+    type_name: str
+    description: str
+    lat: float
+    lng: float
+    timestamp: datetime | None
+    last_seen: datetime | None
+    speed_limit: int | None
+    confirmed: int
+    county: str
+    municipality: str
+    distance: float = field(default=0.0, compare=False)
+    bearing: float = field(default=0.0, compare=False)
+
+    @classmethod
+    def from_response(
+        cls: type[PolitikontrollerControl], response: PoliceControlResponse
+    ) -> PolitikontrollerControl:
+        """Create a record from a control response."""
+        return cls(
+            id=str(response.id),
+            type=sys.intern(str(response.type)),
+            type_name=sys.intern(control_type_name(response)),
+            description=response.description,
+            lat=response.lat,
+            lng=response.lng,
+            timestamp=response.timestamp,
+            last_seen=response.last_seen,
+            speed_limit=response.speed_limit,
+            confirmed=response.confirmed,
+            county=sys.intern(response.county),
+            municipality=sys.intern(response.municipality),
+        )
+
+    @classmethod
+    def from_list(
+        cls: type[PolitikontrollerControl], data: list[Any]
+    ) -> PolitikontrollerControl:
+        """Create a record from its stored form."""
+        (
+            external_id,
+            control_type,
+            type_name,
+            description,
+            lat,
+            lng,
+            timestamp,
+            last_seen,
+            speed_limit,
+            confirmed,
+            county,
+            municipality,
+        ) = data
+        return cls(
+            id=external_id,
+            type=sys.intern(control_type),
+            type_name=sys.intern(type_name),
+            description=description,
+            lat=lat,
+            lng=lng,
+            timestamp=_datetime(timestamp),
+            last_seen=_datetime(last_seen),
+            speed_limit=speed_limit,
+            confirmed=confirmed,
+            county=sys.intern(county),
+            municipality=sys.intern(municipality),
+        )
+
+    def as_list(self) -> list[Any]:
+        """Return the record in its compact stored form."""
+        return [
+            self.id,
+            self.type,
+            self.type_name,
+            self.description,
+            self.lat,
+            self.lng,
+            _timestamp(self.timestamp),
+            _timestamp(self.last_seen),
+            self.speed_limit,
+            self.confirmed,
+            self.county,
+            self.municipality,
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a serializable dict."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "type_name": self.type_name,
+            "title": self.title,
+            "description": self.description,
+            "lat": self.lat,
+            "lng": self.lng,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "speed_limit": self.speed_limit,
+            "confirmed": self.confirmed,
+            "county": self.county,
+            "municipality": self.municipality,
+        }
+
+    @property
+    def title(self) -> str:
+        """Return the title of the control, like the API models do."""
+        description = self.description
+        if len(description) > DESCRIPTION_TRUNCATE_LENGTH:
+            length = DESCRIPTION_TRUNCATE_LENGTH - len(DESCRIPTION_TRUNCATE_SUFFIX)
+            description = f"{description[:length]}{DESCRIPTION_TRUNCATE_SUFFIX}"
+        return f"{self.type}: {description}"
+
+    def size(self) -> int:
+        """Return the approximate memory used by the record in bytes."""
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(getattr(self, name)) for name in self.__slots__
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PolitikontrollerControlChange:
+    """Change of a control in the feed: created, changed or removed."""
+
+    kind: str
+    external_id: str
+    entry: PolitikontrollerControl | None
@@ -0,0 +1,74 @@
+"""Adaptive poll scheduling for the Politikontroller events integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+import random
+
+from .const import (
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL,
+    UPDATE_INTERVAL_JITTER,
+)
+
+# Share of changed entries in a poll above which the feed is considered busy.
+BUSY_CHANGE_RATE = 0.1
+
+
+class PolitikontrollerPollScheduler:
+    """Adjust the poll interval within bounds, based on the activity of the feed.
+
+    The interval shrinks while entries change between polls or tracked entities are
+    moving, grows while the feed is quiet, and backs off exponentially on errors.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta = DEFAULT_MIN_UPDATE_INTERVAL,
+        max_interval: timedelta = DEFAULT_MAX_UPDATE_INTERVAL,
+    ) -> None:
+        """Initialize the poll scheduler."""
+        self._interval = DEFAULT_UPDATE_INTERVAL.total_seconds()
+        self.set_bounds(min_interval, max_interval)
+        self.consecutive_errors = 0
+
+    def set_bounds(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Set the bounds of the poll interval."""
+        self._min_interval = min_interval.total_seconds()
+        self._max_interval = max(self._min_interval, max_interval.total_seconds())
+        self._interval = self._clamp(self._interval)
+
+    @property
+    def interval(self) -> timedelta:
+        """Return the current poll interval, without jitter."""
+        return timedelta(seconds=self._interval)
+
+    def record_update(
+        self,
+        count_changed: int,
+        count_total: int,
+        error: bool = False,  # noqa: FBT001, FBT002
+        moving: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        """Adjust the interval to the outcome of a poll."""
+        if error:
+            self.consecutive_errors += 1
+            self._interval = self._clamp(self._interval * 2)
+            return
+        self.consecutive_errors = 0
+        change_rate = count_changed / max(count_total, 1)
+        if moving or change_rate >= BUSY_CHANGE_RATE:
+            self._interval = self._clamp(self._interval / 2)
+        elif count_changed > 0:
+            self._interval = self._clamp(self._interval * 0.75)
+        else:
+            self._interval = self._clamp(self._interval * 1.25)
+
+    def next_delay(self) -> float:
+        """Return the delay until the next poll in seconds, with jitter applied."""
+        jitter = random.uniform(-UPDATE_INTERVAL_JITTER, UPDATE_INTERVAL_JITTER)  # noqa: S311
+        return self._interval * (1 + jitter)
+
+    def _clamp(self, interval: float) -> float:
+        """Return the interval limited to the configured bounds."""
+        return min(self._max_interval, max(self._min_interval, interval))
@@ -0,0 +1,258 @@
+"""Sensors for the Politikontroller events integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfLength,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_BEARING,
+    ATTR_DISTANCE,
+    ATTR_EXTERNAL_ID,
+    ATTR_TYPE,
+    ATTRIBUTION,
+    DOMAIN,
+)
+from .metrics import STAGE_TOTAL
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
+
+    from .manager import PolitikontrollerFeedEntityManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _no_attributes(manager: PolitikontrollerFeedEntityManager) -> None:  # noqa: ARG001
+    """Return no extra state attributes."""
+
+
+@dataclass(frozen=True, kw_only=True)
+class PolitikontrollerSensorEntityDescription(SensorEntityDescription):
+    """Describes a Politikontroller sensor entity."""
+
+    value_fn: Callable[[PolitikontrollerFeedEntityManager], StateType | datetime]
+    attributes_fn: Callable[
+        [PolitikontrollerFeedEntityManager], dict[str, Any] | None
+    ] = _no_attributes
+
+
+def _cache_hit_rate(manager: PolitikontrollerFeedEntityManager) -> float | None:
+    """Return the share of detail lookups served by the cache."""
+    cache = manager.detail_cache
+    if (lookups := cache.hits + cache.misses) == 0:
+        return None
+    return round(100 * cache.hits / lookups, 1)
+
+
+def _poll_duration(manager: PolitikontrollerFeedEntityManager) -> float | None:
+    """Return the duration of the latest poll."""
+    if (duration := manager.metrics.last(STAGE_TOTAL)) is None:
+        return None
+    return round(duration, 3)
+
+
+def _upstream_requests(manager: PolitikontrollerFeedEntityManager) -> int | None:
+    """Return the number of requests made by the shared client."""
+    if (coordinator := manager.coordinator) is None:
+        return None
+    return coordinator.client.request_count
+
+
+def _nearest_distance(manager: PolitikontrollerFeedEntityManager) -> float | None:
+    """Return the distance to the nearest control."""
+    if not (nearest := manager.nearest()):
+        return None
+    return round(nearest[0][0], 1)
+
+
+def _nearest_attributes(
+    manager: PolitikontrollerFeedEntityManager,
+) -> dict[str, Any] | None:
+    """Return the attributes of the nearest control."""
+    if not (nearest := manager.nearest()):
+        return None
+    if (entry := manager.get_entry(nearest[0][1])) is None:
+        return None
+    return {
+        ATTR_EXTERNAL_ID: entry.id,
+        ATTR_TYPE: entry.type_name.upper(),
+        ATTR_BEARING: round(entry.bearing),
+    }
+
+
+def _newest_timestamp(manager: PolitikontrollerFeedEntityManager) -> datetime | None:
+    """Return the time the newest control was reported."""
+    if (entry := manager.newest) is None or entry.timestamp is None:
+        return None
+    return dt_util.as_local(entry.timestamp)
+
+
+def _newest_attributes(
+    manager: PolitikontrollerFeedEntityManager,
+) -> dict[str, Any] | None:
+    """Return the attributes of the newest control."""
+    if (entry := manager.newest) is None:
+        return None
+    return {
+        ATTR_EXTERNAL_ID: entry.id,
+        ATTR_TYPE: entry.type_name.upper(),
+        ATTR_DISTANCE: round(manager.get_distance(entry.id), 1),
+    }
+
+
+AGGREGATE_SENSORS: tuple[PolitikontrollerSensorEntityDescription, ...] = (
+    PolitikontrollerSensorEntityDescription(
+        key="controls",
+        translation_key="controls",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda manager: sum(manager.type_counts.values()),
+        attributes_fn=lambda manager: dict(sorted(manager.type_counts.items())),
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="nearest_control",
+        translation_key="nearest_control",
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        value_fn=_nearest_distance,
+        attributes_fn=_nearest_attributes,
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="newest_control",
+        translation_key="newest_control",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_newest_timestamp,
+        attributes_fn=_newest_attributes,
+    ),
+)
+
+DIAGNOSTIC_SENSORS: tuple[PolitikontrollerSensorEntityDescription, ...] = (
+    PolitikontrollerSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_poll_duration,
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="update_interval",
+        translation_key="update_interval",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda manager: round(manager.current_interval.total_seconds()),
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="upstream_requests",
+        translation_key="upstream_requests",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=_upstream_requests,
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="failed_updates",
+        translation_key="failed_updates",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda manager: manager.metrics.errors[STAGE_TOTAL],
+    ),
+    PolitikontrollerSensorEntityDescription(
+        key="detail_cache_hit_rate",
+        translation_key="detail_cache_hit_rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_cache_hit_rate,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the Politikontroller sensor platform."""
+    manager: PolitikontrollerFeedEntityManager = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        PolitikontrollerSensor(manager, entry, description)
+        for description in (*AGGREGATE_SENSORS, *DIAGNOSTIC_SENSORS)
+    )
+    _LOGGER.debug("Sensor setup done")
+
+
+class PolitikontrollerSensor(SensorEntity):
+    """Represents a sensor of the controls in, or the state of, a Politikontroller feed."""
+
+    entity_description: PolitikontrollerSensorEntityDescription
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_attribution = ATTRIBUTION
+
+    def __init__(
+        self,
+        feed_manager: PolitikontrollerFeedEntityManager,
+        entry: ConfigEntry,
+        description: PolitikontrollerSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._feed_manager = feed_manager
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._attr_native_value = description.value_fn(feed_manager)
+        self._attr_extra_state_attributes = description.attributes_fn(feed_manager)
+
+    async def async_added_to_hass(self) -> None:
+        """Call when entity is added to hass."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._feed_manager.signal_status_update,
+                self._update_callback,
+            )
+        )
+
+    @callback
+    def _update_callback(self) -> None:
+        """Write the state, if the value or attributes changed."""
+        value = self.entity_description.value_fn(self._feed_manager)
+        attributes = self.entity_description.attributes_fn(self._feed_manager)
+        if (
+            value != self._attr_native_value
+            or attributes != self._attr_extra_state_attributes
+        ):
+            self._attr_native_value = value
+            self._attr_extra_state_attributes = attributes
+            self.async_write_ha_state()
@@ -0,0 +1,110 @@
+"""Services for the Politikontroller events integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, CONF_RADIUS
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+import homeassistant.util.dt as dt_util
+
+from .archive import STATISTICS
+from .const import (
+    ATTR_EXTERNAL_ID,
+    ATTR_LIMIT,
+    ATTR_SINCE,
+    ATTR_STATISTIC,
+    ATTR_TYPE,
+    ATTR_UNTIL,
+    DATA_ARCHIVE,
+    DOMAIN,
+    SERVICE_GET_CONTROL_DETAILS,
+    SERVICE_QUERY_ARCHIVE,
+)
+from .manager import async_get_control_details
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+GET_CONTROL_DETAILS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_EXTERNAL_ID): cv.string,
+    }
+)
+
+QUERY_ARCHIVE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_STATISTIC): vol.In(STATISTICS),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(ATTR_UNTIL): cv.datetime,
+        vol.Optional(ATTR_TYPE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Inclusive(ATTR_LATITUDE, "area"): cv.latitude,
+        vol.Inclusive(ATTR_LONGITUDE, "area"): cv.longitude,
+        vol.Inclusive(CONF_RADIUS, "area"): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the Politikontroller events integration."""
+
+    async def get_control_details(call: ServiceCall) -> ServiceResponse:
+        """Return all details of a control."""
+        external_id: str = call.data[ATTR_EXTERNAL_ID]
+        if (details := async_get_control_details(hass, external_id)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="control_not_found",
+                translation_placeholders={ATTR_EXTERNAL_ID: external_id},
+            )
+        return details
+
+    async def query_archive(call: ServiceCall) -> ServiceResponse:
+        """Return a statistic of the archived controls."""
+        if (archive := hass.data.get(DATA_ARCHIVE)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="archive_not_enabled",
+            )
+        since = call.data.get(ATTR_SINCE)
+        until = call.data.get(ATTR_UNTIL)
+        return await archive.async_query(
+            call.data[ATTR_STATISTIC],
+            since=dt_util.as_utc(since) if since else None,
+            until=dt_util.as_utc(until) if until else None,
+            types=call.data.get(ATTR_TYPE),
+            area=(
+                (
+                    call.data[ATTR_LATITUDE],
+                    call.data[ATTR_LONGITUDE],
+                    call.data[CONF_RADIUS],
+                )
+                if ATTR_LATITUDE in call.data
+                else None
+            ),
+            limit=call.data[ATTR_LIMIT],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONTROL_DETAILS,
+        get_control_details,
+        schema=GET_CONTROL_DETAILS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_ARCHIVE,
+        query_archive,
+        schema=QUERY_ARCHIVE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
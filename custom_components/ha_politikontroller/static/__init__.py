@@ -1,6 +1,67 @@
 """Static files."""
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from homeassistant.components.http import StaticPathConfig
+
+from ..const import DATA_ICONS, URL_BASE
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
 
 
 def locate_dir() -> str:
     """Return path to static files."""
     return __path__[0]
+
+
+@dataclass(slots=True)
+class PolitikontrollerIcons:
+    """Icons of the control types, with a version hash of their contents."""
+
+    version: str
+    icons: dict[str, bytes]
+    _data_uris: dict[str, str] = field(default_factory=dict)
+
+    def url(self, type_name: str, *, inline: bool = False) -> str:
+        """Return the URL of the icon of a control type.
+
+        URLs are versioned by content, so they can be cached by browsers for good.
+        Inlined icons are data URIs, which need no request at all.
+        """
+        if not inline or type_name not in self.icons:
+            return f"{URL_BASE}/img/{type_name}.png?v={self.version}"
+        if (data_uri := self._data_uris.get(type_name)) is None:
+            data_uri = "data:image/png;base64," + base64.b64encode(
+                self.icons[type_name]
+            ).decode()
+            self._data_uris[type_name] = data_uri
+        return data_uri
+
+
+def load_icons() -> PolitikontrollerIcons:
+    """Load all icons, and hash their contents."""
+    digest = hashlib.sha256()
+    icons = {}
+    for path in sorted(Path(locate_dir(), "img").glob("*.png")):
+        icons[path.stem] = path.read_bytes()
+        digest.update(path.name.encode())
+        digest.update(icons[path.stem])
+    return PolitikontrollerIcons(digest.hexdigest()[:8], icons)
+
+
+async def async_setup_static(hass: HomeAssistant) -> PolitikontrollerIcons:
+    """Register the icons once for the integration, and return them."""
+    if (icons := hass.data.get(DATA_ICONS)) is not None:
+        return icons
+    icons = await hass.async_add_executor_job(load_icons)
+    await hass.http.async_register_static_paths(
+        [StaticPathConfig(f"{URL_BASE}/img", f"{locate_dir()}/img", cache_headers=True)]
+    )
+    hass.data[DATA_ICONS] = icons
+    return icons
@@ -0,0 +1,185 @@
+"""WebSocket API for the Politikontroller events integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import ATTR_EXTERNAL_ID, DOMAIN, SIGNAL_FEED_STARTED
+from .geojson import feature, feature_collection, get_managers
+from .manager import async_get_control_details
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .manager import PolitikontrollerFeedEntityManager
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands of the Politikontroller events integration."""
+    websocket_api.async_register_command(hass, websocket_control_details)
+    websocket_api.async_register_command(hass, websocket_subscribe_controls)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/control_details",
+        vol.Required(ATTR_EXTERNAL_ID): str,
+    }
+)
+@callback
+def websocket_control_details(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return all details of a control."""
+    if (details := async_get_control_details(hass, msg[ATTR_EXTERNAL_ID])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Control not found")
+        return
+    connection.send_result(msg["id"], details)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_controls",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_controls(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the controls of one, or all, config entries, and then their changes.
+
+    The first event is a GeoJSON feature collection. Each following event only has
+    the features created and changed, and the ids removed, by an update of a feed.
+
+    When a feed is stopped, like when its entry is reloaded, an event marks its end.
+    A subscription to one entry ends with it, and is subscribed to again by the
+    client. A subscription to all entries goes on, and sends all controls of feeds
+    started later as created.
+    """
+    entry_id = msg.get("entry_id")
+    if (managers := get_managers(hass, entry_id)) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not found")
+        return
+    subscription = PolitikontrollerControlSubscription(
+        connection, msg["id"], single=entry_id is not None
+    )
+    for manager in managers:
+        subscription.async_listen(manager)
+    if entry_id is None:
+        subscription.async_follow_started_feeds(hass)
+    connection.subscriptions[msg["id"]] = subscription.async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], feature_collection(managers))
+    )
+
+
+class PolitikontrollerControlSubscription:
+    """Forward the changes of feeds to a WebSocket subscription."""
+
+    def __init__(
+        self,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        single: bool,  # noqa: FBT001
+    ) -> None:
+        """Initialize the subscription."""
+        self._connection = connection
+        self._msg_id = msg_id
+        self._single = single
+        self._remove_listeners: dict[
+            PolitikontrollerFeedEntityManager, Callable[[], None]
+        ] = {}
+        self._unsub_started: Callable[[], None] | None = None
+
+    @callback
+    def async_listen(self, manager: PolitikontrollerFeedEntityManager) -> None:
+        """Forward the changes of a feed, until it is stopped."""
+        self._remove_listeners[manager] = manager.async_add_change_listener(
+            lambda *changes: self._forward_changes(manager, *changes),
+            lambda: self._feed_stopped(manager),
+        )
+
+    @callback
+    def async_follow_started_feeds(self, hass: HomeAssistant) -> None:
+        """Send all controls of feeds started later, and then their changes."""
+        self._unsub_started = async_dispatcher_connect(
+            hass, SIGNAL_FEED_STARTED, self._feed_started
+        )
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Stop forwarding changes."""
+        if self._unsub_started is not None:
+            self._unsub_started()
+            self._unsub_started = None
+        for remove_listener in self._remove_listeners.values():
+            remove_listener()
+        self._remove_listeners.clear()
+
+    @callback
+    def _feed_started(self, manager: PolitikontrollerFeedEntityManager) -> None:
+        """Send all controls of a started feed as created, unless already listening."""
+        if manager in self._remove_listeners:
+            return
+        self.async_listen(manager)
+        self._forward_changes(manager, set(manager.managed_external_ids), set(), set())
+
+    @callback
+    def _feed_stopped(self, manager: PolitikontrollerFeedEntityManager) -> None:
+        """Send the end of a feed, and end a subscription to that feed alone."""
+        self._remove_listeners.pop(manager, None)
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id, {"entry_id": manager.entry_id, "ended": True}
+            )
+        )
+        if self._single:
+            # The client subscribes again, to the feed of the reloaded entry.
+            self._connection.subscriptions.pop(self._msg_id, None)
+
+    @callback
+    def _forward_changes(
+        self,
+        manager: PolitikontrollerFeedEntityManager,
+        created: set[str],
+        updated: set[str],
+        removed: set[str],
+    ) -> None:
+        """Send the changes of an update of a feed."""
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id,
+                {
+                    "entry_id": manager.entry_id,
+                    "stale": manager.stale,
+                    "created": _features(manager, created),
+                    "changed": _features(manager, updated),
+                    "removed": list(removed),
+                },
+            )
+        )
+
+
+def _features(
+    manager: PolitikontrollerFeedEntityManager, external_ids: set[str]
+) -> list[dict[str, Any]]:
+    """Return the GeoJSON features of controls of a feed."""
+    return [
+        feature(entry, manager.entry_id)
+        for external_id in external_ids
+        if (entry := manager.get_entry(external_id)) is not None
+    ]
@@ -0,0 +1 @@
+"""Tests for the Politikontroller events integration."""
@@ -0,0 +1,85 @@
+"""Helpers for the Politikontroller events integration tests."""
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING, Final, TypeVar
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    get_test_instance_port,
+)
+
+from custom_components.ha_politikontroller.client import PolitikontrollerClientRegistry
+from custom_components.ha_politikontroller.const import (
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    DATA_CLIENTS,
+    DOMAIN,
+)
+from homeassistant.const import (
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PASSWORD,
+    CONF_RADIUS,
+    CONF_USERNAME,
+)
+from homeassistant.setup import async_setup_component
+
+from .fake_client import FakePolitikontrollerApi, FakePolitikontrollerClient
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+    from custom_components.ha_politikontroller.manager import (
+        PolitikontrollerFeedEntityManager,
+    )
+    from homeassistant.core import HomeAssistant
+
+_T = TypeVar("_T")
+
+CENTER: Final = (59.91, 10.75)
+RADIUS: Final = 20.0
+USERNAME: Final = "4791234567"
+PASSWORD: Final = "secret"
+
+
+def run(hass: HomeAssistant, coroutine: Coroutine[None, None, _T]) -> _T:
+    """Run a coroutine in the event loop of a Home Assistant instance in a thread."""
+    return asyncio.run_coroutine_threadsafe(coroutine, hass.loop).result()
+
+
+def use_fake_api(hass: HomeAssistant, api: FakePolitikontrollerApi) -> None:
+    """Make config entries fetch from a fake API."""
+    hass.data[DATA_CLIENTS] = PolitikontrollerClientRegistry(
+        hass, partial(FakePolitikontrollerClient, api=api)
+    )
+
+
+async def async_setup_fake_entry(
+    hass: HomeAssistant, api: FakePolitikontrollerApi
+) -> PolitikontrollerFeedEntityManager:
+    """Set up a config entry fetching from a fake API, and return its manager.
+
+    Only the first poll is run right away, further polls are started by the tests.
+    """
+    use_fake_api(hass, api)
+    assert await async_setup_component(
+        hass,
+        "http",
+        {"http": {"server_host": ["127.0.0.1"], "server_port": get_test_instance_port()}},
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: USERNAME,
+            CONF_PASSWORD: PASSWORD,
+            CONF_LATITUDE: CENTER[0],
+            CONF_LONGITUDE: CENTER[1],
+            CONF_RADIUS: RADIUS,
+        },
+        options={CONF_MIN_UPDATE_INTERVAL: 3600, CONF_MAX_UPDATE_INTERVAL: 3600},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    return hass.data[DOMAIN][entry.entry_id]
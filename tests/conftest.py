@@ -0,0 +1,45 @@
+"""Fixtures for the Politikontroller events integration tests."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+from homeassistant import loader
+
+from .common import CENTER, run
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture()
+def bench_hass(
+    socket_enabled: None,  # noqa: ARG001
+) -> Generator[HomeAssistant, None, None]:
+    """Return a Home Assistant instance running in a thread, with custom integrations.
+
+    The benchmark fixture calls the measured function synchronously, so coroutines are
+    run in the event loop of this instance instead of in the loop of the test. Sockets
+    are enabled for the HTTP server of the integration.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="BenchmarkLoop")
+    thread.start()
+    context = async_test_home_assistant()
+    try:
+        hass = asyncio.run_coroutine_threadsafe(context.__aenter__(), loop).result()
+        hass.config.latitude, hass.config.longitude = CENTER
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+        yield hass
+        run(hass, hass.async_stop(force=True))
+        run(hass, context.__aexit__(None, None, None))
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
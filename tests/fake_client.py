@@ -0,0 +1,236 @@
+"""Local stand-in for the Politikontroller API, used by tests and benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from math import asin, cos, degrees, radians, sin, sqrt
+import random
+from typing import TYPE_CHECKING, Any
+
+from politikontroller_py.models.api import APIEndpoint, PoliceControlTypeEnum
+
+from custom_components.ha_politikontroller.client import PolitikontrollerClient
+
+if TYPE_CHECKING:
+    from politikontroller_py.models import PoliceGPSControlsResponse
+    from politikontroller_py.models.api import PolitiKontrollerRequest
+
+EARTH_RADIUS_KM = 6371.0088
+LOGIN_OK = (
+    "LOGIN_OK|NO|0|47|SKIP_AUTHENTICATION|1000|0|Fake|NO_SAPHE|NO_REGNR|29|NO|NO"
+    "|+4740000000|30|true|false|0|false"
+)
+CONTROL_TYPES = list(PoliceControlTypeEnum)
+
+
+def _distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the great-circle distance between two points in kilometers."""
+    a = (
+        sin(radians(lat2 - lat1) / 2) ** 2
+        + cos(radians(lat1)) * cos(radians(lat2)) * sin(radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+@dataclass(slots=True)
+class FakeControl:
+    """Synthetic police control."""
+
+    id: int  # noqa: A003
+    type: str  # noqa: A003
+    description: str
+    lat: float
+    lng: float
+    timestamp: datetime
+    confirmed: int = 1
+
+    def list_row(self) -> str:
+        """Return the control as a row of a control list response."""
+        return "|".join(
+            (
+                str(self.id),
+                "Oslo",
+                "Oslo",
+                self.type,
+                self.timestamp.strftime("%d.%m - %H:%M"),
+                self.description,
+                str(self.lat),
+                str(self.lng),
+                "",
+                "",
+                "",
+                "",
+            )
+        )
+
+    def detail_row(self) -> str:
+        """Return the control as a control details response."""
+        return "|".join(
+            (
+                str(self.id),
+                "Oslo",
+                "Oslo",
+                self.type,
+                self.timestamp.strftime("%d.%m - %H:%M"),
+                self.description,
+                str(self.lat),
+                str(self.lng),
+                "",
+                "",
+                "oslo.png",
+                "oslo.png",
+                "80",
+                "1",
+                self.timestamp.strftime("%H:%M"),
+                "0",
+                "2",
+                str(self.confirmed),
+            )
+        )
+
+
+class FakeControlSet:
+    """Synthetic set of active controls, spread evenly over a circle.
+
+    Churn replaces a share of the controls with new ones, and confirms another share
+    again, like the controls of a busy area change between polls.
+    """
+
+    def __init__(
+        self,
+        center: tuple[float, float],
+        radius: float,
+        count: int,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the control set."""
+        self.center = center
+        self.radius = radius
+        self.controls: dict[int, FakeControl] = {}
+        self._random = random.Random(seed)
+        self._next_id = 1
+        self._now = datetime.now().replace(second=0, microsecond=0)  # noqa: DTZ005
+        for _ in range(count):
+            self._add()
+
+    def __len__(self) -> int:
+        """Return the number of controls."""
+        return len(self.controls)
+
+    def _add(self) -> None:
+        """Add a control at a random position, not too close to the edge."""
+        distance = 0.95 * self.radius * sqrt(self._random.random())
+        bearing = self._random.uniform(0, 360)
+        lat = self.center[0] + degrees(
+            distance * cos(radians(bearing)) / EARTH_RADIUS_KM
+        )
+        lng = self.center[1] + degrees(
+            distance
+            * sin(radians(bearing))
+            / (EARTH_RADIUS_KM * cos(radians(self.center[0])))
+        )
+        control_id = self._next_id
+        self._next_id += 1
+        self.controls[control_id] = FakeControl(
+            id=control_id,
+            type=CONTROL_TYPES[control_id % len(CONTROL_TYPES)],
+            description=f"Control {control_id}",
+            lat=round(lat, 6),
+            lng=round(lng, 6),
+            timestamp=self._now,
+        )
+
+    def churn(self, replaced: float = 0.0, confirmed: float = 0.0) -> tuple[int, int]:
+        """Replace and confirm shares of the controls, and return how many of each."""
+        count_replaced = round(len(self.controls) * replaced)
+        count_confirmed = round(len(self.controls) * confirmed)
+        picked = self._random.sample(
+            list(self.controls), count_replaced + count_confirmed
+        )
+        self._now += timedelta(minutes=1)
+        for control_id in picked[:count_replaced]:
+            del self.controls[control_id]
+            self._add()
+        for control_id in picked[count_replaced:]:
+            control = self.controls[control_id]
+            control.timestamp = self._now
+            control.confirmed += 1
+        return count_replaced, count_confirmed
+
+    def within(self, lat: float, lng: float, radius: float) -> list[FakeControl]:
+        """Return the controls within a radius."""
+        return [
+            control
+            for control in self.controls.values()
+            if _distance(lat, lng, control.lat, control.lng) <= radius
+        ]
+
+
+class FakePolitikontrollerApi:
+    """Answer API requests from a synthetic control set, like politikontroller.no."""
+
+    def __init__(self, controls: FakeControlSet, latency: float = 0.0) -> None:
+        """Initialize the fake API, answering each request after a latency."""
+        self.controls = controls
+        self.latency = latency
+        self.requests: Counter[str] = Counter()
+
+    async def respond(self, request: PolitiKontrollerRequest) -> str:
+        """Return the decrypted response to a request."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.requests[request.p] += 1
+        if request.p == APIEndpoint.LOGIN:
+            return LOGIN_OK
+        if request.p == APIEndpoint.GPS_CONTROLS:
+            return "#".join(
+                control.list_row()
+                for control in self.controls.within(
+                    float(request.lat), float(request.lon), float(request.vr)
+                )
+            )
+        if request.p == APIEndpoint.SPEED_CONTROL and (
+            control := self.controls.controls.get(int(request.kontroll_id))
+        ):
+            return control.detail_row()
+        # Parsed as no content by the client.
+        return ""
+
+
+@dataclass
+class FakePolitikontrollerClient(PolitikontrollerClient):
+    """Client answered by a fake API instead of politikontroller.no."""
+
+    api: FakePolitikontrollerApi | None = None
+    merge: bool = False
+
+    async def do_external_api_request(
+        self,
+        request: PolitiKontrollerRequest,
+        **kwargs: Any,  # noqa: ARG002
+    ) -> str:
+        """Answer a request from the fake API, counting it like a real request."""
+        self.request_count += 1
+        data = await self.api.respond(request)
+        self.characters_received += len(data)
+        return data
+
+    async def get_controls_in_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius: int,
+        speed: int = 100,
+        merge_duplicates: bool = True,  # noqa: FBT001, FBT002
+        **kwargs: Any,
+    ) -> list[PoliceGPSControlsResponse]:
+        """Get all active controls within a radius, merging duplicates if enabled.
+
+        Merging duplicates is quadratic in the number of controls, and would dominate
+        benchmarks of large control sets.
+        """
+        return await super().get_controls_in_radius(
+            lat, lng, radius, speed, merge_duplicates and self.merge, **kwargs
+        )
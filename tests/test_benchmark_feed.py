@@ -0,0 +1,270 @@
+"""Benchmarks of the feed manager against a fake Politikontroller API."""
+from __future__ import annotations
+
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from politikontroller_py.models.api import APIEndpoint
+import pytest
+
+from custom_components.ha_politikontroller.coordinator import (
+    PolitikontrollerFetchCoordinator,
+)
+from custom_components.ha_politikontroller.manager import PolitikontrollerFeedManager
+
+from .common import CENTER, PASSWORD, RADIUS, USERNAME, run
+from .fake_client import (
+    FakeControlSet,
+    FakePolitikontrollerApi,
+    FakePolitikontrollerClient,
+)
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from homeassistant.core import HomeAssistant
+
+SIZES = [10, 100, 1_000, 10_000]
+# Merging duplicate controls is quadratic, so it is only benchmarked up to this size.
+MERGE_MAX_SIZE = 1_000
+# Sizes, and whether duplicate controls are merged like in production.
+MERGE_CASES = [
+    *((size, False) for size in SIZES),
+    *((size, True) for size in SIZES if size <= MERGE_MAX_SIZE),
+]
+# Share of controls replaced, and share confirmed again, between two polls.
+CHURN = 0.05
+# Budget for the memory of one feed entry record, in bytes.
+ENTRY_SIZE_BUDGET = 1024
+
+
+class EntityCallbacks:
+    """Count the entity callbacks of a feed manager."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.created = 0
+        self.updated = 0
+        self.removed = 0
+
+    @property
+    def churn(self) -> int:
+        """Return the number of created and removed entities."""
+        return self.created + self.removed
+
+    async def generate(self, external_ids: set[str]) -> None:
+        """Count created entities."""
+        self.created += len(external_ids)
+
+    async def update(self, external_id: str) -> None:  # noqa: ARG002
+        """Count updated entities."""
+        self.updated += 1
+
+    async def remove(self, external_id: str) -> None:  # noqa: ARG002
+        """Count removed entities."""
+        self.removed += 1
+
+
+async def _async_coordinator(
+    hass: HomeAssistant,
+    api: FakePolitikontrollerApi,
+    merge: bool = False,  # noqa: FBT001, FBT002
+) -> PolitikontrollerFetchCoordinator:
+    """Return a fetch coordinator of an account authenticated with a fake API."""
+    client = FakePolitikontrollerClient(api=api, merge=merge)
+    await client.authenticate_user(USERNAME, PASSWORD)
+    return PolitikontrollerFetchCoordinator(hass, client)
+
+
+async def _async_feed(
+    hass: HomeAssistant,
+    api: FakePolitikontrollerApi,
+    coordinator: PolitikontrollerFetchCoordinator | None = None,
+    center: tuple[float, float] = CENTER,
+    merge: bool = False,  # noqa: FBT001, FBT002
+) -> tuple[PolitikontrollerFeedManager, EntityCallbacks]:
+    """Return a feed manager fetching from a fake API, and its entity callbacks."""
+    callbacks = EntityCallbacks()
+    feed = PolitikontrollerFeedManager(
+        hass,
+        coordinator or await _async_coordinator(hass, api, merge),
+        callbacks.generate,
+        callbacks.update,
+        callbacks.remove,
+        center,
+        RADIUS,
+    )
+    return feed, callbacks
+
+
+@pytest.mark.parametrize(("size", "merge"), MERGE_CASES)
+def test_first_poll(
+    benchmark: BenchmarkFixture,
+    bench_hass: HomeAssistant,
+    size: int,
+    merge: bool,  # noqa: FBT001
+) -> None:
+    """Benchmark the first poll, which fetches details and creates every entity."""
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, size))
+
+    def setup() -> tuple[tuple[PolitikontrollerFeedManager, EntityCallbacks], dict]:
+        return run(bench_hass, _async_feed(bench_hass, api, merge=merge)), {}
+
+    def poll(feed: PolitikontrollerFeedManager, callbacks: EntityCallbacks) -> EntityCallbacks:
+        run(bench_hass, feed.update())
+        return callbacks
+
+    callbacks = benchmark.pedantic(poll, setup=setup, rounds=3)
+    benchmark.extra_info["entity_churn"] = callbacks.churn
+    # Controls of the same type close to each other are merged into one.
+    assert callbacks.created <= size if merge else callbacks.created == size
+    assert callbacks.removed == 0
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unchanged_poll(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, size: int
+) -> None:
+    """Benchmark a poll of an unchanged control list, which only lists the controls."""
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, size))
+    feed, callbacks = run(bench_hass, _async_feed(bench_hass, api))
+    run(bench_hass, feed.update())
+    detail_requests = feed.metrics.counters["detail_requests"]
+
+    benchmark(lambda: run(bench_hass, feed.update()))
+
+    assert callbacks.created == size
+    assert callbacks.updated == 0
+    assert callbacks.removed == 0
+    assert feed.metrics.counters["detail_requests"] == detail_requests
+    assert feed.metrics.counters["unchanged_updates"] > 0
+
+
+@pytest.mark.parametrize(("size", "merge"), MERGE_CASES)
+def test_churn_poll(
+    benchmark: BenchmarkFixture,
+    bench_hass: HomeAssistant,
+    size: int,
+    merge: bool,  # noqa: FBT001
+) -> None:
+    """Benchmark a poll after some controls are replaced, and some confirmed again.
+
+    Duplicates are merged on every changed list, so merging is measured here.
+    """
+    controls = FakeControlSet(CENTER, RADIUS, size)
+    api = FakePolitikontrollerApi(controls)
+    feed, callbacks = run(bench_hass, _async_feed(bench_hass, api, merge=merge))
+    run(bench_hass, feed.update())
+    replaced = 0
+    confirmed = 0
+
+    def setup() -> tuple[tuple, dict]:
+        nonlocal replaced, confirmed
+        churn = controls.churn(replaced=CHURN, confirmed=CHURN)
+        replaced += churn[0]
+        confirmed += churn[1]
+        return (), {}
+
+    benchmark.pedantic(lambda: run(bench_hass, feed.update()), setup=setup, rounds=5)
+    benchmark.extra_info["entity_churn"] = callbacks.churn - size
+    benchmark.extra_info["entity_updates"] = callbacks.updated
+
+    assert callbacks.created - callbacks.removed == len(feed.feed_entries)
+    if merge:
+        # Replaced controls can merge with, or separate from, other controls.
+        return
+    # Only the replaced and confirmed controls reach the entities.
+    assert callbacks.created == size + replaced
+    assert callbacks.removed == replaced
+    assert callbacks.updated == confirmed
+    assert len(feed.feed_entries) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_memory_per_entry(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, size: int
+) -> None:
+    """Measure the memory of the feed state per entry, over a first poll."""
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, size))
+    feed, _ = run(bench_hass, _async_feed(bench_hass, api))
+
+    tracemalloc.start()
+    try:
+        benchmark.pedantic(lambda: run(bench_hass, feed.update()), rounds=1)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    entry_size = sum(entry.size() for entry in feed.feed_entries.values()) / size
+    benchmark.extra_info["allocated_per_entry"] = allocated / size
+    benchmark.extra_info["record_size"] = entry_size
+
+    assert len(feed.feed_entries) == size
+    assert entry_size < ENTRY_SIZE_BUDGET
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.01, 0.05])
+def test_poll_latency(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, latency: float
+) -> None:
+    """Benchmark a first poll of 100 controls with a slow API.
+
+    Details are fetched through a bounded pool, so the latency is paid about once for
+    every pool worth of requests, instead of once per control.
+    """
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, 100), latency)
+
+    def setup() -> tuple[tuple[PolitikontrollerFeedManager, EntityCallbacks], dict]:
+        return run(bench_hass, _async_feed(bench_hass, api)), {}
+
+    def poll(feed: PolitikontrollerFeedManager, callbacks: EntityCallbacks) -> EntityCallbacks:
+        run(bench_hass, feed.update())
+        return callbacks
+
+    callbacks = benchmark.pedantic(poll, setup=setup, rounds=3)
+    assert callbacks.created == 100
+
+
+async def _async_cycle_feeds(
+    hass: HomeAssistant, api: FakePolitikontrollerApi, count: int
+) -> PolitikontrollerFetchCoordinator:
+    """Return a coordinator polling feeds of overlapping circles in its cycles."""
+    coordinator = await _async_coordinator(hass, api)
+    for index in range(count):
+        # About 5 km apart, so every circle overlaps the next one.
+        center = (CENTER[0] + 0.05 * index, CENTER[1])
+        feed, _ = await _async_feed(hass, api, coordinator, center)
+        coordinator.async_register_region(center, RADIUS)
+        coordinator.async_add_poller(feed.update, lambda: 3600)
+    return coordinator
+
+
+@pytest.mark.parametrize("entries", [1, 2, 5])
+def test_cycle_poll(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, entries: int
+) -> None:
+    """Benchmark a poll cycle of overlapping entries of one account.
+
+    The entries share one query covering all of them, so every cycle sends one list
+    request upstream, whatever the number of entries.
+    """
+    controls = FakeControlSet(CENTER, 2 * RADIUS, 1_000)
+    api = FakePolitikontrollerApi(controls)
+    coordinator = run(bench_hass, _async_cycle_feeds(bench_hass, api, entries))
+    run(bench_hass, coordinator.async_run_cycle())
+    list_requests = api.requests[APIEndpoint.GPS_CONTROLS]
+    cycles = coordinator.cycles
+
+    def setup() -> tuple[tuple, dict]:
+        controls.churn(replaced=CHURN, confirmed=CHURN)
+        return (), {}
+
+    benchmark.pedantic(
+        lambda: run(bench_hass, coordinator.async_run_cycle()),
+        setup=setup,
+        rounds=5,
+    )
+    list_requests = api.requests[APIEndpoint.GPS_CONTROLS] - list_requests
+    cycles = coordinator.cycles - cycles
+    benchmark.extra_info["list_requests_per_cycle"] = list_requests / cycles
+
+    assert list_requests == cycles
@@ -0,0 +1,109 @@
+"""Benchmarks of the geo_location platform against a fake Politikontroller API."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from homeassistant.components.geo_location import DOMAIN as GEO_LOCATION_DOMAIN
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .common import CENTER, RADIUS, async_setup_fake_entry, run
+from .fake_client import FakeControlSet, FakePolitikontrollerApi
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from custom_components.ha_politikontroller.manager import (
+        PolitikontrollerFeedEntityManager,
+    )
+
+SIZES = [10, 100, 1_000]
+# Share of controls replaced, and share confirmed again, between two polls.
+CHURN = 0.05
+
+
+async def _async_setup_entry(
+    hass: HomeAssistant, api: FakePolitikontrollerApi
+) -> tuple[PolitikontrollerFeedEntityManager, list[Event]]:
+    """Set up a config entry fetching from a fake API.
+
+    Returns the feed entity manager, and the geo_location state writes after setup.
+    """
+    manager = await async_setup_fake_entry(hass, api)
+    await _async_poll(hass, manager)
+
+    writes: list[Event] = []
+
+    @callback
+    def state_changed(event: Event) -> None:
+        if event.data["entity_id"].startswith(f"{GEO_LOCATION_DOMAIN}."):
+            writes.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+    return manager, writes
+
+
+async def _async_poll(
+    hass: HomeAssistant, manager: PolitikontrollerFeedEntityManager
+) -> None:
+    """Poll the feed, and wait for the entities to be added, updated and removed."""
+    await manager.async_update()
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_setup(benchmark: BenchmarkFixture, bench_hass: HomeAssistant, size: int) -> None:
+    """Benchmark setting up a config entry, and creating an entity for every control."""
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, size))
+
+    benchmark.pedantic(
+        lambda: run(bench_hass, _async_setup_entry(bench_hass, api)), rounds=1
+    )
+
+    assert len(bench_hass.states.async_entity_ids(GEO_LOCATION_DOMAIN)) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unchanged_poll(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, size: int
+) -> None:
+    """Benchmark a poll of an unchanged control list, which writes no states."""
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, size))
+    manager, writes = run(bench_hass, _async_setup_entry(bench_hass, api))
+
+    benchmark(lambda: run(bench_hass, _async_poll(bench_hass, manager)))
+
+    assert writes == []
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_churn_poll(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, size: int
+) -> None:
+    """Benchmark a poll after some controls are replaced, and some confirmed again."""
+    controls = FakeControlSet(CENTER, RADIUS, size)
+    api = FakePolitikontrollerApi(controls)
+    manager, writes = run(bench_hass, _async_setup_entry(bench_hass, api))
+    changed = 0
+
+    def setup() -> tuple[tuple, dict]:
+        nonlocal changed
+        replaced, confirmed = controls.churn(replaced=CHURN, confirmed=CHURN)
+        # Every replaced control removes one entity and adds another.
+        changed += 2 * replaced + confirmed
+        return (), {}
+
+    rounds = 5
+    benchmark.pedantic(
+        lambda: run(bench_hass, _async_poll(bench_hass, manager)),
+        setup=setup,
+        rounds=rounds,
+    )
+    benchmark.extra_info["state_writes_per_poll"] = len(writes) / rounds
+
+    # States of unchanged controls are not written again. Small sets may not churn.
+    assert len(writes) <= changed
+    assert writes or not changed
+    assert len(bench_hass.states.async_entity_ids(GEO_LOCATION_DOMAIN)) == size
@@ -0,0 +1,74 @@
+"""Benchmarks of importing the integration, and of setting up a config entry."""
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from .common import CENTER, RADIUS, async_setup_fake_entry, run
+from .fake_client import FakeControlSet, FakePolitikontrollerApi
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from homeassistant.core import HomeAssistant
+
+PACKAGE = "custom_components.ha_politikontroller"
+ROOT = Path(__file__).parent.parent
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Import a module in a new interpreter, and return cumulative import times.
+
+    The times, in microseconds, are read from the output of python -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],  # noqa: S603
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", [PACKAGE, f"{PACKAGE}.config_flow"])
+def test_import_time(benchmark: BenchmarkFixture, module: str) -> None:
+    """Benchmark importing the integration and its config flow.
+
+    Neither should import the API client library, which is only imported in the
+    executor when the integration is set up.
+    """
+    times = benchmark.pedantic(_import_times, args=(module,), rounds=3)
+    benchmark.extra_info["import_time_us"] = times[module]
+
+    assert "politikontroller_py" not in times
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.05])
+def test_setup_time(
+    benchmark: BenchmarkFixture, bench_hass: HomeAssistant, latency: float
+) -> None:
+    """Benchmark setting up a config entry against an API with latency.
+
+    Authentication overlaps with setting up the platforms, so setup takes about one
+    round trip longer than without latency.
+    """
+    api = FakePolitikontrollerApi(FakeControlSet(CENTER, RADIUS, 100), latency)
+
+    manager = benchmark.pedantic(
+        lambda: run(bench_hass, async_setup_fake_entry(bench_hass, api)), rounds=1
+    )
+    benchmark.extra_info["setup_duration"] = manager.setup_duration
+
+    assert manager.setup_duration is not None